@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.urls import reverse
 from django.utils.html import format_html
 
-from api.models import RecipeShortLink
+from api.models import ExportJob, RecipeShortLink
 from recipe.models import Recipe
 
 
@@ -53,3 +53,26 @@ class RecipeShortLinkAdmin(admin.ModelAdmin):
         if db_field.name == 'recipe':
             kwargs['queryset'] = Recipe.objects.order_by('name')
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'owner',
+        'file_format',
+        'status',
+        'created_at',
+        'finished_at'
+    )
+    list_filter = ('status', 'file_format')
+    search_fields = ('owner__username',)
+    readonly_fields = (
+        'owner',
+        'file_format',
+        'status',
+        'file',
+        'error',
+        'created_at',
+        'finished_at'
+    )
+    list_per_page = 20
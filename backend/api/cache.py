@@ -0,0 +1,170 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+from api.constants import (EXPORT_CACHE_ALIAS, EXPORT_CACHE_MAX_FILE_SIZE,
+                           EXPORT_CACHE_MAX_SIZE, EXPORT_CACHE_TIMEOUT,
+                           RECIPE_FRAGMENT_TIMEOUT, SHORT_LINK_CACHE_TIMEOUT,
+                           SHORT_LINK_LOCAL_TTL, SHORT_LINK_LRU_SIZE)
+
+
+def recipe_fragment_key(recipe, request):
+    """Ключ кеша общей для всех пользователей части рецепта.
+
+    Ключ содержит версию рецепта, поэтому любое изменение рецепта делает
+    старый фрагмент недоступным. Адрес сервера входит в ключ, так как
+    ссылки на изображения в представлении абсолютные.
+    """
+    return (f'recipe:{recipe.id}:{recipe.version}:'
+            f'{request.scheme}://{request.get_host()}')
+
+
+def get_recipe_fragments(keys):
+    """Пакетное чтение фрагментов рецептов из кеша."""
+    return cache.get_many(keys)
+
+
+def set_recipe_fragments(fragments):
+    """Пакетная запись фрагментов рецептов в кеш."""
+    cache.set_many(fragments, timeout=RECIPE_FRAGMENT_TIMEOUT)
+
+
+def export_cache_key(recipe_versions, totals, file_format):
+    """Ключ файла списка покупок по содержимому корзины.
+
+    Строится из пар (id, версия) рецептов корзины, пар (id ингредиента,
+    количество) итогов корзины и формата файла, поэтому одинаковые корзины
+    разных пользователей дают один и тот же файл, а изменение любого
+    рецепта или пересчёт итогов даёт новый ключ.
+    """
+    digest = sha256(file_format.encode())
+    for recipe_id, version in sorted(recipe_versions):
+        digest.update(f':{recipe_id}.{version}'.encode())
+    digest.update(b'|')
+    for ingredient_id, amount in sorted(totals):
+        digest.update(f':{ingredient_id}.{amount}'.encode())
+    return digest.hexdigest()
+
+
+def get_export(key):
+    """Чтение готового файла списка покупок из кеша."""
+    return caches[EXPORT_CACHE_ALIAS].get(f'export:{key}')
+
+
+def set_export(key, content):
+    """Запись готового файла списка покупок в кеш."""
+    if len(content) > EXPORT_CACHE_MAX_FILE_SIZE:
+        return
+    caches[EXPORT_CACHE_ALIAS].set(
+        f'export:{key}', content, timeout=EXPORT_CACHE_TIMEOUT
+    )
+
+
+class SizeLimitedLocMemCache(LocMemCache):
+    """Кеш в памяти процесса с ограничением суммарного размера.
+
+    Помимо числа записей ограничен объём значений в байтах (параметр
+    OPTIONS['MAX_SIZE']): при превышении удаляются давно не
+    использованные записи.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._max_size = int(
+            params.get('OPTIONS', {}).get('MAX_SIZE', EXPORT_CACHE_MAX_SIZE)
+        )
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        super()._set(key, value, timeout)
+        size = sum(len(item) for item in self._cache.values())
+        while size > self._max_size:
+            old_key, old_value = self._cache.popitem()
+            del self._expire_info[old_key]
+            size -= len(old_value)
+
+
+class LocalLRUCache:
+    """Потокобезопасный LRU-кеш процесса с временем жизни записей."""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires < monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+short_links = LocalLRUCache(SHORT_LINK_LRU_SIZE, SHORT_LINK_LOCAL_TTL)
+
+
+def _short_link_cache():
+    alias = settings.SHORT_LINK_CACHE
+    return caches[alias] if alias else None
+
+
+def get_short_link_path(short_code):
+    """Путь страницы рецепта по короткому коду.
+
+    Сначала проверяется кеш процесса, затем общий кеш, если он задан
+    настройкой SHORT_LINK_CACHE. Записи кеша процесса живут недолго,
+    чтобы удаление рецепта в другом процессе быстро становилось видно.
+    """
+    path = short_links.get(short_code)
+    if path is None:
+        shared = _short_link_cache()
+        if shared is not None:
+            path = shared.get(f'short-link:{short_code}')
+            if path is not None:
+                short_links.set(short_code, path)
+    return path
+
+
+def set_short_link_path(short_code, path):
+    """Запись пути страницы рецепта для короткого кода."""
+    short_links.set(short_code, path)
+    shared = _short_link_cache()
+    if shared is not None:
+        shared.set(
+            f'short-link:{short_code}', path,
+            timeout=SHORT_LINK_CACHE_TIMEOUT
+        )
+
+
+def delete_short_link_path(short_code):
+    """Удаление короткого кода из кешей."""
+    short_links.delete(short_code)
+    shared = _short_link_cache()
+    if shared is not None:
+        shared.delete(f'short-link:{short_code}')
@@ -2,8 +2,100 @@ MAX_FILE_SIZE = 10 * 1024 * 1024
 
 ALLOW_EXT = ('jpg', 'jpeg', 'png')
 
+BASE64_CHUNK_SIZE = 64 * 1024
+
+BASE64_MARKER = ';base64,'
+
+BASE64_TAIL_SIZE = 16
+
+IMAGE_VARIANT_SIZES = {
+    'thumb': (160, 160),
+    'card': (480, 480),
+    'full': (1280, 1280),
+}
+
+IMAGE_VARIANT_FORMATS = ('webp', 'jpeg')
+
+IMAGE_VARIANT_QUALITY = 80
+
+IMAGE_VARIANTS_DIR = 'variants'
+
+IMPORT_BATCH_SIZE = 500
+
+IMPORT_MAX_AMOUNT = 32767
+
+IMPORT_FORMAT_PARAM = 'format'
+
 MIN_INGREDIENTS_VALUE = 1
 
-MAX_LENGTH_SHORT_CODE = 3
+MAX_LENGTH_SHORT_CODE = 12
+
+MIN_LENGTH_SHORT_CODE = 4
+
+LEGACY_LENGTH_SHORT_CODE = 3
+
+SHORT_CODE_MULTIPLIER = 1580030173
+
+SHORT_CODE_OFFSET = 9876543
+
+SHORT_LINK_LRU_SIZE = 10000
+
+SHORT_LINK_LOCAL_TTL = 60
+
+SHORT_LINK_CACHE_TIMEOUT = 24 * 60 * 60
+
+SHORT_LINK_MAX_AGE = 60 * 60
 
 PAGE_SIZE = 6
+
+CURSOR_PAGINATION_PARAM = 'pagination'
+
+CURSOR_POSITION_SEPARATOR = '|'
+
+RECIPE_FRAGMENT_TIMEOUT = 24 * 60 * 60
+
+FIELDS_PARAM = 'fields'
+
+OMIT_PARAM = 'omit'
+
+EXPORT_CHUNK_SIZE = 8 * 1024
+
+EXPORT_DB_CHUNK_SIZE = 500
+
+EXPORT_CACHE_ALIAS = 'exports'
+
+EXPORT_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+EXPORT_CACHE_MAX_FILE_SIZE = 1024 * 1024
+
+EXPORT_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+EXPORT_ASYNC_PARAM = 'async'
+
+EXPORT_JOB_TTL = 24 * 60 * 60
+
+EXPORT_JOB_TIMEOUT = 10 * 60
+
+LEN_FILE_FORMAT = 10
+
+LEN_EXPORT_STATUS = 10
+
+PDF_FONT_NAME = 'Greca'
+
+PDF_FONT_FILE = 'greca.ttf'
+
+PDF_LOGO_FILE = 'logo.png'
+
+PDF_FONT_SIZE = 20
+
+PDF_FOOTER_FONT_SIZE = 10
+
+PDF_LINE_HEIGHT = 20
+
+PDF_FIRST_LINE_Y = 660
+
+PDF_BOTTOM_MARGIN = 50
+
+LEN_TABLE_NAME = 100
+
+TABLE_VERSION_MIN_STEP = 1
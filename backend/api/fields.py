@@ -1,27 +1,119 @@
 import base64
+import string
+from io import BytesIO
 
-from django.core.files.base import ContentFile
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import (InMemoryUploadedFile,
+                                            TemporaryUploadedFile)
 from rest_framework import serializers
 
+from api.constants import (BASE64_CHUNK_SIZE, BASE64_MARKER, BASE64_TAIL_SIZE,
+                           MAX_FILE_SIZE)
+
 
 class Base64ImageField(serializers.ImageField):
-    """Поле для обработки Base64-изображений."""
+    """Поле для обработки Base64-изображений.
+
+    Помимо строки Base64 принимает файл из multipart/form-data. Размер
+    Base64-файла вычисляется по длине закодированной строки до
+    декодирования, без копирования строки. Строка декодируется по частям:
+    небольшие файлы собираются в памяти, большие во временном файле на
+    диске.
+    """
 
-    def __init__(self, name='None', *args, **kwargs):
+    def __init__(self, name='None', max_size=MAX_FILE_SIZE, *args,
+                 **kwargs):
         self.default_error_messages['required'] = 'Обязательное поле'
         self.default_error_messages['invalid'] = 'Пустое значение'
         self.name = name
+        self.max_size = max_size
         super().__init__(*args, **kwargs)
 
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
-            format, image_str = data.split(';base64,')
-            ext = format.split('/')[-1]
+            header_end = data.find(BASE64_MARKER)
+            if header_end == -1:
+                raise serializers.ValidationError(
+                    'Ошибка декодирования Base64: нет данных изображения')
+            ext = data[:header_end].split('/')[-1]
+            start = header_end + len(BASE64_MARKER)
+            size = self._decoded_size(data, start)
+            self._validate_size(size)
             try:
-                decoded_image = base64.b64decode(image_str)
+                data = self._decode(data, start, f'_{self.name}.{ext}',
+                                    f'image/{ext}', size)
             except Exception as e:
                 raise serializers.ValidationError(
                     f'Ошибка декодирования Base64: {e}')
-            file_name = f'_{self.name}.{ext}'
-            data = ContentFile(decoded_image, name=file_name)
+        self._validate_size(getattr(data, 'size', 0))
         return super().to_internal_value(data)
+
+    def _decoded_size(self, data, start):
+        """Размер файла по Base64-строке с позиции start без её копирования.
+
+        Пробелы и переводы строк подсчитываются, только если размер по
+        полной длине строки превышает max_size.
+        """
+        tail = data[-BASE64_TAIL_SIZE:].rstrip()
+        length = len(data) - start - (len(tail) - len(tail.rstrip('=')))
+        if length * 3 // 4 > self.max_size:
+            length -= sum(
+                data.count(char, start) for char in string.whitespace
+            )
+        return length * 3 // 4
+
+    def _validate_size(self, size):
+        if size > self.max_size:
+            raise serializers.ValidationError(
+                f'Максимальный размер файла '
+                f'{self.max_size / (1024 * 1024)} Мб'
+            )
+
+    def _decode(self, data, start, file_name, content_type, size):
+        """Декодирование Base64-строки в загруженный файл по частям."""
+        if size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+            file = TemporaryUploadedFile(
+                file_name, content_type, size, None
+            )
+        else:
+            file = InMemoryUploadedFile(
+                BytesIO(), None, file_name, content_type, size, None
+            )
+        buffer = ''
+        for chunk_start in range(start, len(data), BASE64_CHUNK_SIZE):
+            buffer += ''.join(
+                data[chunk_start:chunk_start + BASE64_CHUNK_SIZE].split()
+            )
+            aligned = len(buffer) - len(buffer) % 4
+            file.write(base64.b64decode(buffer[:aligned]))
+            buffer = buffer[aligned:]
+        if buffer:
+            base64.b64decode(buffer)
+        file.size = file.tell()
+        file.seek(0)
+        return file
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Ссылки на уменьшенные копии изображения.
+
+    Возвращает словарь вида {размер: {формат: ссылка}} или None, пока
+    копии ещё не созданы.
+    """
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        return {
+            name: {
+                file_format: self._build_url(request, path)
+                for file_format, path in paths.items()
+            }
+            for name, paths in value.items() if name != 'source'
+        }
+
+    def _build_url(self, request, path):
+        url = default_storage.url(path)
+        return request.build_absolute_uri(url) if request else url
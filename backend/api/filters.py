@@ -34,6 +34,10 @@ class RecipeFilter(django_filters.FilterSet):
     )
     is_favorited = django_filters.NumberFilter(
         method='in_favorited_filter')
+    ordering = django_filters.ChoiceFilter(
+        choices=(('popular', 'По популярности'),),
+        method='ordering_filter'
+    )
 
     class Meta:
         model = Recipe
@@ -65,3 +69,11 @@ class RecipeFilter(django_filters.FilterSet):
         if value:
             return queryset.filter(favorited_by=user)
         return queryset
+
+    def ordering_filter(self, queryset, name, value):
+        """Сортировка по числу добавлений в избранное и корзины."""
+        if value == 'popular':
+            return queryset.order_by(
+                '-favorites_count', '-cart_count', '-pub_date'
+            )
+        return queryset
@@ -0,0 +1,112 @@
+import posixpath
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from api.constants import (IMAGE_VARIANT_FORMATS, IMAGE_VARIANT_QUALITY,
+                           IMAGE_VARIANT_SIZES, IMAGE_VARIANTS_DIR)
+from recipe.models import Recipe
+
+User = get_user_model()
+
+
+def needs_variants(field_file, variants):
+    """Проверка, что копии не соответствуют текущему изображению."""
+    return (variants or {}).get('source') != (field_file.name or None)
+
+
+def build_image_variants(field_file):
+    """Создание уменьшенных копий изображения в форматах WebP и JPEG.
+
+    Копии строятся от большей к меньшей, каждая из предыдущей. Возвращает
+    словарь путей вида {размер: {формат: путь}} и путь исходного файла.
+    """
+    storage = field_file.storage
+    directory, file_name = posixpath.split(field_file.name)
+    stem = posixpath.splitext(file_name)[0]
+    variants = {'source': field_file.name}
+    sizes = sorted(
+        IMAGE_VARIANT_SIZES.items(), key=lambda item: item[1], reverse=True
+    )
+    with field_file.open('rb'), Image.open(field_file) as image:
+        image.draft('RGB', sizes[0][1])
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+        for name, size in sizes:
+            image.thumbnail(size, Image.LANCZOS)
+            variants[name] = {
+                file_format: storage.save(
+                    posixpath.join(
+                        directory,
+                        IMAGE_VARIANTS_DIR,
+                        f'{stem}_{name}.{file_format}'
+                    ),
+                    ContentFile(_encode(image, file_format)),
+                )
+                for file_format in IMAGE_VARIANT_FORMATS
+            }
+    return variants
+
+
+def delete_image_variants(storage, variants):
+    """Удаление файлов копий изображения."""
+    for name, paths in variants.items():
+        if name == 'source':
+            continue
+        for path in paths.values():
+            storage.delete(path)
+
+
+def update_image_variants(model, pk, field_name):
+    """Обновление копий изображения объекта.
+
+    Копии сохраняются, только если за время обработки изображение объекта
+    не сменилось. Возвращает True, если копии объекта изменились.
+    """
+    instance = model.objects.filter(pk=pk).only(
+        field_name, 'image_variants'
+    ).first()
+    if instance is None:
+        return False
+    field_file = getattr(instance, field_name)
+    if not needs_variants(field_file, instance.image_variants):
+        return False
+    variants = build_image_variants(field_file) if field_file else {}
+    updated = model.objects.filter(
+        pk=pk, **{field_name: field_file.name}
+    ).update(image_variants=variants)
+    delete_image_variants(
+        field_file.storage,
+        instance.image_variants if updated else variants,
+    )
+    return bool(updated)
+
+
+def update_recipe_variants(recipe_id):
+    """Обновление копий фото рецепта."""
+    if update_image_variants(Recipe, recipe_id, 'image'):
+        Recipe.objects.filter(pk=recipe_id).bump_version()
+
+
+def update_avatar_variants(user_id):
+    """Обновление копий аватара пользователя."""
+    if update_image_variants(User, user_id, 'avatar'):
+        Recipe.objects.filter(author_id=user_id).bump_version()
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA') or (
+        image.mode == 'P' and 'transparency' in image.info
+    )
+
+
+def _encode(image, file_format):
+    if file_format == 'jpeg' and image.mode == 'RGBA':
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    buffer = BytesIO()
+    image.save(buffer, file_format.upper(), quality=IMAGE_VARIANT_QUALITY)
+    return buffer.getvalue()
@@ -4,10 +4,11 @@ from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from api.filters import StartsWithIngredientFilter
 from api.ingredient.serializers import IngredientSerializer
+from api.mixins import ConditionalGetMixin
 from ingredient.models import Ingredient
 
 
-class IngredientViewSet(ReadOnlyModelViewSet):
+class IngredientViewSet(ConditionalGetMixin, ReadOnlyModelViewSet):
     """Вьюсет для ингредиентов.
     Показывает список всех доступных ингредиентов.
     Показывает ингредиент по id.
@@ -0,0 +1,195 @@
+import json
+import platform
+import random
+import statistics
+import tracemalloc
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.order.exporters import EXPORTERS
+from api.order.generator import OrderGenerator
+from foodgram.settings import BASE_DIR
+from ingredient.models import Ingredient, RecipeIngredient
+from recipe.models import Recipe
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Замеряет формирование списка покупок для корзин разного '
+            'размера: время, пиковую память и число запросов к базе. '
+            'Тестовые данные создаются в транзакции и откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10, 100, 1000],
+            help='Количество рецептов в корзине',
+        )
+        parser.add_argument(
+            '--formats',
+            nargs='+',
+            choices=sorted(EXPORTERS),
+            default=sorted(EXPORTERS),
+            help='Форматы файла',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Количество замеров времени для каждого случая',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Начальное значение генератора случайных чисел',
+        )
+        parser.add_argument(
+            '--ingredients-file',
+            default='data/ingredients.json',
+            help='Путь к JSON файлу с ингредиентами',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для результатов в JSON (по умолчанию stdout)',
+        )
+
+    def handle(self, *args, **kwargs):
+        self.random = random.Random(kwargs['seed'])
+        with transaction.atomic():
+            try:
+                cart = self.seed(
+                    max(kwargs['sizes']), kwargs['ingredients_file']
+                )
+                results = [
+                    self.measure(cart, size, file_format, kwargs['repeat'])
+                    for size in kwargs['sizes']
+                    for file_format in kwargs['formats']
+                ]
+            finally:
+                transaction.set_rollback(True)
+
+        report = json.dumps({
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'seed': kwargs['seed'],
+            'repeat': kwargs['repeat'],
+            'results': results,
+        }, ensure_ascii=False, indent=2)
+        if kwargs['output']:
+            with open(kwargs['output'], 'w', encoding='utf-8') as file:
+                file.write(report)
+            for result in results:
+                self.stdout.write(
+                    '{format} recipes={recipes} lines={lines}: '
+                    '{time_median_ms} ms, {memory_peak_kb} KB, '
+                    '{queries} queries, {size_kb} KB'.format(**result)
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f'Результаты записаны в {kwargs["output"]}'
+            ))
+        else:
+            self.stdout.write(report)
+
+    def seed(self, count, ingredients_file):
+        """Создание пользователя и рецептов для корзин.
+
+        Ингредиенты выбираются с весами 1/ранг, поэтому популярные
+        ингредиенты повторяются в разных рецептах, как в реальных данных.
+        """
+        if not Ingredient.objects.exists():
+            with open(BASE_DIR / ingredients_file, encoding='utf-8') as file:
+                Ingredient.objects.bulk_create(
+                    Ingredient(**item) for item in json.load(file)
+                )
+        ingredient_ids = list(
+            Ingredient.objects.order_by('pk').values_list('pk', flat=True)
+        )
+        weights = [1 / rank for rank in range(1, len(ingredient_ids) + 1)]
+
+        user = User.objects.create_user(
+            username='benchmark_order',
+            email='benchmark_order@example.com',
+            password=None,
+            first_name='Benchmark',
+            last_name='Order',
+        )
+        Recipe.objects.bulk_create(
+            Recipe(
+                name=f'Рецепт {num}',
+                author=user,
+                text='Тестовый рецепт',
+                cooking_time=self.random.randint(5, 120),
+                image='recipes/foto/benchmark.png',
+            ) for num in range(count)
+        )
+        recipe_ids = list(
+            Recipe.objects.filter(author=user).
+            order_by('pk').values_list('pk', flat=True)
+        )
+        recipe_ingredients = []
+        for recipe_id in recipe_ids:
+            size = self.random.randint(3, 12)
+            chosen = set()
+            while len(chosen) < size:
+                chosen.update(self.random.choices(
+                    ingredient_ids, weights, k=size - len(chosen)
+                ))
+            recipe_ingredients.extend(
+                RecipeIngredient(
+                    recipe_id=recipe_id,
+                    ingredient_id=ingredient_id,
+                    amount=self.random.randint(1, 500),
+                ) for ingredient_id in chosen
+            )
+        RecipeIngredient.objects.bulk_create(
+            recipe_ingredients, batch_size=1000
+        )
+        self.recipe_ids = recipe_ids
+        return user.cart
+
+    def measure(self, cart, size, file_format, repeat):
+        """Замер формирования файла без кеша готовых файлов."""
+        cart.recipes.set(self.recipe_ids[:size])
+
+        def render():
+            order = OrderGenerator(cart, file_format)
+            return order.exporter_class(
+                order.get_lines(), order.file_name
+            ).render()
+
+        timings = []
+        for _ in range(repeat):
+            started = perf_counter()
+            render()
+            timings.append(perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                content = render()
+            memory_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        if isinstance(content, str):
+            content = content.encode()
+
+        return {
+            'format': file_format,
+            'recipes': size,
+            'lines': cart.ingredient_totals.count(),
+            'time_min_ms': round(min(timings) * 1000, 2),
+            'time_median_ms': round(statistics.median(timings) * 1000, 2),
+            'memory_peak_kb': round(memory_peak / 1024, 1),
+            'queries': len(queries),
+            'size_kb': round(len(content) / 1024, 1),
+        }
@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from api.images import (needs_variants, update_avatar_variants,
+                        update_recipe_variants)
+from recipe.models import Recipe
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Создаёт уменьшенные копии фото рецептов и аватаров, для '
+            'которых они отсутствуют или устарели')
+
+    def handle(self, *args, **kwargs):
+        recipes = self._generate(Recipe, 'image', update_recipe_variants)
+        users = self._generate(User, 'avatar', update_avatar_variants)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлены копии фото рецептов: {recipes}, аватаров: {users}'
+        ))
+
+    def _generate(self, model, field_name, update):
+        count = 0
+        objects = model.objects.only(
+            field_name, 'image_variants'
+        ).iterator()
+        for instance in objects:
+            if needs_variants(getattr(instance, field_name),
+                              instance.image_variants):
+                update(instance.pk)
+                count += 1
+        return count
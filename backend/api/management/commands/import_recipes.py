@@ -0,0 +1,83 @@
+import json
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.constants import IMPORT_BATCH_SIZE
+from api.recipe.importer import READERS, RecipeImporter
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Импортирует рецепты из файла NDJSON или CSV пачками. Строки '
+            'с ошибками пропускаются и выводятся в отчёте.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('file_path', type=str, help='Путь к файлу')
+        parser.add_argument(
+            '--format',
+            dest='file_format',
+            choices=sorted(READERS),
+            help='Формат файла (по умолчанию по расширению)',
+        )
+        parser.add_argument(
+            '--author',
+            help='Имя пользователя автора для строк без поля author',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Количество строк в пачке',
+        )
+
+    def handle(self, *args, **kwargs):
+        file_path = kwargs['file_path']
+        file_format = (
+            kwargs['file_format']
+            or os.path.splitext(file_path)[1].lstrip('.').lower()
+        )
+        if file_format not in READERS:
+            raise CommandError(
+                f'Формат файла не поддерживается: {file_format}'
+            )
+        author = None
+        if kwargs['author']:
+            try:
+                author = User.objects.get(username=kwargs['author'])
+            except User.DoesNotExist:
+                raise CommandError(
+                    f'Пользователь не найден: {kwargs["author"]}'
+                )
+
+        importer = RecipeImporter(
+            author=author, batch_size=kwargs['batch_size']
+        )
+        processed = created = failed = 0
+        with open(file_path, encoding='utf-8-sig', newline='') as file:
+            try:
+                for batch in importer.run(READERS[file_format](file)):
+                    processed += batch.processed
+                    created += len(batch.created)
+                    failed += len(batch.errors)
+                    for error in batch.errors:
+                        errors = json.dumps(
+                            error['errors'], ensure_ascii=False
+                        )
+                        self.stderr.write(
+                            f'Строка {error["row"]}: {errors}'
+                        )
+                    self.stdout.write(
+                        f'Обработано: {processed}, создано: {created}, '
+                        f'ошибок: {failed}'
+                    )
+            except UnicodeDecodeError:
+                raise CommandError(
+                    f'Файл должен быть в кодировке UTF-8, создано '
+                    f'рецептов: {created}'
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Импорт завершён. Создано рецептов: {created}'
+        ))
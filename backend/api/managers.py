@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.db import models
+from django.db.models import ExpressionWrapper, F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from api.constants import TABLE_VERSION_MIN_STEP
+
+
+class TableVersionManager(models.Manager):
+    """Менеджер версий таблиц."""
+
+    def get_for_model(self, model):
+        """Версия таблицы модели; для неизменявшейся таблицы нулевая."""
+        table = model._meta.label_lower
+        return self.filter(table=table).first() or self.model(table=table)
+
+    def bump(self, model):
+        """Увеличивает версию таблицы модели.
+
+        Время изменения сдвигается не меньше чем на TABLE_VERSION_MIN_STEP
+        секунд, поэтому каждое изменение даёт новое значение Last-Modified,
+        точность которого ограничена секундой.
+        """
+        table = model._meta.label_lower
+        now = timezone.now()
+        step = timedelta(seconds=TABLE_VERSION_MIN_STEP)
+        updated = self.filter(table=table).update(
+            version=F('version') + 1,
+            updated_at=Greatest(
+                ExpressionWrapper(
+                    F('updated_at') + step,
+                    output_field=models.DateTimeField(),
+                ),
+                Value(now),
+            ),
+        )
+        if not updated:
+            self.get_or_create(
+                table=table, defaults={'version': 1, 'updated_at': now}
+            )
@@ -0,0 +1,36 @@
+# Generated by Django 3.2 on 2026-10-18 16:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0003_auto_20250316_2305'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_format', models.CharField(max_length=10, verbose_name='Формат файла')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Готово'), ('failed', 'Ошибка')], default='pending', max_length=10, verbose_name='Статус')),
+                ('file', models.FileField(blank=True, upload_to='exports/', verbose_name='Файл')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата завершения')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Владелец')),
+            ],
+            options={
+                'verbose_name': 'Выгрузка списка покупок',
+                'verbose_name_plural': 'Выгрузки списков покупок',
+                'ordering': ['-created_at'],
+                'default_related_name': 'export_jobs',
+            },
+        ),
+    ]
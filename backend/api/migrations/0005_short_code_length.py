@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 17:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_exportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipeshortlink',
+            name='short_code',
+            field=models.CharField(blank=True, max_length=12, unique=True),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2 on 2026-10-18 17:40
+
+from django.db import migrations, models
+from django.db.models import Max
+from django.utils import timezone
+
+
+def fill_versions(apps, schema_editor):
+    TableVersion = apps.get_model('api', 'TableVersion')
+    for model in (
+        apps.get_model('recipe', 'Tag'),
+        apps.get_model('ingredient', 'Ingredient'),
+    ):
+        updated_at = model.objects.aggregate(
+            updated_at=Max('updated_at')
+        )['updated_at']
+        TableVersion.objects.create(
+            table=model._meta.label_lower,
+            version=1,
+            updated_at=updated_at or timezone.now(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_short_code_length'),
+        ('ingredient', '0007_ingredient_updated_at'),
+        ('recipe', '0012_recipe_tag_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=100, unique=True, verbose_name='Таблица')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Версия')),
+                ('updated_at', models.DateTimeField(verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Версия таблицы',
+                'verbose_name_plural': 'Версии таблиц',
+            },
+        ),
+        migrations.RunPython(fill_versions, migrations.RunPython.noop),
+    ]
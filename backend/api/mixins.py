@@ -0,0 +1,119 @@
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.serializers import ListSerializer
+
+from api.constants import FIELDS_PARAM, OMIT_PARAM
+from api.models import TableVersion
+
+
+class ConditionalGetMixin:
+    """Условные GET-запросы для вьюсетов.
+
+    ETag и Last-Modified вычисляются до сериализации. Если клиент
+    передал совпадающий If-None-Match или не более старый
+    If-Modified-Since, он получает 304, а сериализатор не запускается.
+    По умолчанию используется версия всей таблицы модели из TableVersion:
+    её номер и время изменения только растут, в том числе при удалении
+    строк.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+
+    def get_table_version(self):
+        """Версия таблицы модели вьюсета, читается один раз за запрос."""
+        if not hasattr(self, '_table_version'):
+            self._table_version = TableVersion.objects.get_for_model(
+                self.queryset.model
+            )
+        return self._table_version
+
+    def get_conditional_etag(self):
+        """ETag для текущего запроса."""
+        return str(self.get_table_version().version)
+
+    def get_conditional_last_modified(self):
+        """Время изменения для текущего запроса (timestamp) или None."""
+        updated_at = self.get_table_version().updated_at
+        return int(updated_at.timestamp()) if updated_at else None
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def _conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        etag = quote_etag(self.get_conditional_etag())
+        last_modified = self.get_conditional_last_modified()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+
+class SparseFieldsMixin:
+    """Выбор полей ответа параметрами ?fields= и ?omit= для вьюсетов.
+
+    Выбранные поля передаются в контекст сериализатора и в план запросов,
+    поэтому пропущенные связи не загружаются из базы.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+
+    def get_sparse_fields(self):
+        """Множество запрошенных полей или None, если выбор не задан."""
+        if self.action not in self.sparse_actions:
+            return None
+        fields = self._split_param(FIELDS_PARAM)
+        omit = self._split_param(OMIT_PARAM)
+        if not fields and not omit:
+            return None
+        if not fields:
+            fields = set(self.get_serializer_class().Meta.fields)
+        return frozenset(fields - omit)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'] = self.get_sparse_fields()
+        return context
+
+    def _split_param(self, name):
+        value = self.request.query_params.get(name, '')
+        return {field.strip() for field in value.split(',') if field.strip()}
+
+
+class SparseFieldsSerializerMixin:
+    """Ограничение полей корневого сериализатора по контексту.
+
+    Вложенные сериализаторы выводятся целиком: выбор относится только к
+    полям верхнего уровня.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse_fields = self.context.get('sparse_fields')
+        if sparse_fields is None or not self._is_sparse_root():
+            return fields
+        return type(fields)(
+            (name, field) for name, field in fields.items()
+            if name in sparse_fields
+        )
+
+    def _is_sparse_root(self):
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        return parent is None
@@ -1,10 +1,13 @@
-import random
-import string
+import uuid
 
+from django.conf import settings
 from django.db import models
 from django.urls import reverse
 
-from api.constants import MAX_LENGTH_SHORT_CODE
+from api.constants import (LEN_EXPORT_STATUS, LEN_FILE_FORMAT, LEN_TABLE_NAME,
+                           MAX_LENGTH_SHORT_CODE)
+from api.managers import TableVersionManager
+from api.shortcodes import encode_short_code
 
 
 class RecipeShortLink(models.Model):
@@ -28,21 +31,24 @@ class RecipeShortLink(models.Model):
             self.short_code = self.generate_short_code()
         super(RecipeShortLink, self).save(*args, **kwargs)
 
-    def generate_short_code(self, length=MAX_LENGTH_SHORT_CODE):
-        characters = string.ascii_letters + string.digits
-        while True:
-            code = ''.join(random.choice(characters) for _ in range(length))
-            if not RecipeShortLink.objects.filter(short_code=code).exists():
-                return code
+    def generate_short_code(self):
+        """Код ссылки, однозначно вычисляемый по id рецепта.
+
+        Коды не короче MIN_LENGTH_SHORT_CODE символов и не пересекаются
+        с трёхсимвольными кодами, выданными ранее случайным образом.
+        """
+        return encode_short_code(self.recipe_id)
 
     def get_short_url(self, request):
         return request.build_absolute_uri(f'/s/{self.short_code}')
 
+    def get_original_path(self):
+        """Путь страницы рецепта на сайте, без загрузки самого рецепта."""
+        url = reverse('recipes-detail', kwargs={'pk': self.recipe_id})
+        return url.replace('/api/', '/')
+
     def get_original_url(self, request):
-        url = reverse('recipes-detail', kwargs={'pk': self.recipe.id})
-        full_url = request.build_absolute_uri(url)
-        full_url = full_url.replace('/api/', '/')
-        return full_url
+        return request.build_absolute_uri(self.get_original_path())
 
     def __str__(self):
         return f'{self.get_short_url}'
@@ -58,3 +64,92 @@ class RecipeShortLink(models.Model):
                 name='unique_short_link',
             )
         ]
+
+
+class ExportJob(models.Model):
+    """Задача фонового формирования списка покупок."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Готово'
+        FAILED = 'failed', 'Ошибка'
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        verbose_name='Владелец'
+    )
+    file_format = models.CharField(
+        max_length=LEN_FILE_FORMAT,
+        verbose_name='Формат файла'
+    )
+    status = models.CharField(
+        max_length=LEN_EXPORT_STATUS,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Статус'
+    )
+    file = models.FileField(
+        upload_to='exports/',
+        blank=True,
+        verbose_name='Файл'
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Ошибка'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата завершения'
+    )
+
+    class Meta:
+        verbose_name = 'Выгрузка списка покупок'
+        verbose_name_plural = 'Выгрузки списков покупок'
+        default_related_name = 'export_jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.owner} {self.file_format} ({self.status})'
+
+
+class TableVersion(models.Model):
+    """Версия таблицы для условных GET-запросов.
+
+    Номер версии и время изменения только растут: они увеличиваются
+    сигналами при сохранении и удалении строк таблицы, в том числе
+    самой новой.
+    """
+
+    table = models.CharField(
+        max_length=LEN_TABLE_NAME,
+        unique=True,
+        verbose_name='Таблица'
+    )
+    version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Версия'
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения'
+    )
+
+    objects = TableVersionManager()
+
+    class Meta:
+        verbose_name = 'Версия таблицы'
+        verbose_name_plural = 'Версии таблиц'
+
+    def __str__(self):
+        return f'{self.table} {self.version}'
@@ -0,0 +1,233 @@
+import csv
+import os
+from functools import lru_cache
+from io import BytesIO
+from math import ceil
+from threading import Lock
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from api import constants as c
+
+EXPORTERS = {}
+
+pdf_logo_lock = Lock()
+
+
+def register_exporter(exporter_class):
+    """Регистрация экспортёра списка покупок по его формату."""
+    EXPORTERS[exporter_class.file_format] = exporter_class
+    return exporter_class
+
+
+def buffered(chunks, size=c.EXPORT_CHUNK_SIZE):
+    """Объединение мелких фрагментов в блоки не меньше size символов."""
+    buffer = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def collected(chunks, callback, limit=c.EXPORT_CACHE_MAX_FILE_SIZE):
+    """Передача блоков дальше с накоплением копии файла.
+
+    Когда все блоки отданы, файл целиком передаётся в callback. Файлы
+    больше limit байт не накапливаются.
+    """
+    parts = []
+    size = 0
+    for chunk in chunks:
+        if parts is not None:
+            data = chunk.encode(settings.DEFAULT_CHARSET)
+            size += len(data)
+            if size <= limit:
+                parts.append(data)
+            else:
+                parts = None
+        yield chunk
+    if parts is not None:
+        callback(b''.join(parts))
+
+
+@lru_cache(maxsize=None)
+def get_pdf_font():
+    """Шрифт для pdf, регистрируемый один раз на процесс."""
+    font_path = os.path.join(settings.BASE_DIR, 'fonts', c.PDF_FONT_FILE)
+    pdfmetrics.registerFont(TTFont(c.PDF_FONT_NAME, font_path))
+    return c.PDF_FONT_NAME
+
+
+@lru_cache(maxsize=None)
+def get_pdf_logo():
+    """Логотип для pdf, загружаемый и декодируемый один раз на процесс.
+
+    Объект общий для потоков процесса, рисуется под pdf_logo_lock.
+    """
+    logo = ImageReader(os.path.join(settings.BASE_DIR, c.PDF_LOGO_FILE))
+    logo.getRGBData()
+    return logo
+
+
+class Echo:
+    """Псевдобуфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+class BaseExporter:
+    """Базовый экспортёр списка покупок.
+
+    Получает строки списка вида (номер, название, единица измерения,
+    количество) и формирует файл одного формата. Всё состояние хранится
+    в экземпляре, поэтому экспорт можно выполнять параллельно.
+    """
+
+    file_format = None
+    content_type = None
+    streaming = False
+
+    def __init__(self, lines, file_name):
+        self.lines = lines
+        self.file_name = file_name
+
+    def render(self):
+        """Содержимое файла целиком."""
+        return ''.join(self.iter_content())
+
+    def iter_content(self):
+        """Содержимое файла по частям (реализуется в дочерних классах)."""
+        raise NotImplementedError
+
+    def get_response(self, on_complete=None):
+        """HTTP-ответ с файлом.
+
+        Потоковые экспортёры отдают файл блоками по мере чтения строк из
+        базы, не собирая его в памяти. Если передан on_complete, он
+        получает готовый файл в байтах после его формирования.
+        """
+        if self.streaming:
+            content = buffered(self.iter_content())
+            if on_complete is not None:
+                content = collected(content, on_complete)
+            response = StreamingHttpResponse(
+                content, content_type=self.content_type
+            )
+        else:
+            content = self.render()
+            if on_complete is not None:
+                on_complete(content)
+            response = HttpResponse(content, content_type=self.content_type)
+        return self.with_file_name(response, self.file_name)
+
+    @classmethod
+    def file_response(cls, content, file_name):
+        """HTTP-ответ с уже сформированным файлом."""
+        return cls.with_file_name(
+            HttpResponse(content, content_type=cls.content_type), file_name
+        )
+
+    @classmethod
+    def with_file_name(cls, response, file_name):
+        response['Content-Disposition'] = (
+            f'attachment; filename="{file_name}.{cls.file_format}"'
+        )
+        return response
+
+
+@register_exporter
+class TxtExporter(BaseExporter):
+    """Потоковый экспорт списка покупок в txt."""
+
+    file_format = 'txt'
+    content_type = 'text/plain'
+    streaming = True
+
+    def iter_content(self):
+        yield 'Список покупок:\n\n'
+        for num, name, unit, total_amount in self.lines:
+            yield f'{num}. {name} — {total_amount} {unit}\n'
+
+
+@register_exporter
+class CsvExporter(BaseExporter):
+    """Потоковый экспорт списка покупок в csv."""
+
+    file_format = 'csv'
+    content_type = 'text/csv'
+    streaming = True
+
+    def iter_content(self):
+        writer = csv.writer(Echo())
+        yield writer.writerow(
+            ['п/п', 'Название', 'Единица измерения', 'Общее кол-во']
+        )
+        for line in self.lines:
+            yield writer.writerow(line)
+
+
+@register_exporter
+class PdfExporter(BaseExporter):
+    """Экспорт списка покупок в pdf.
+
+    Шапка с логотипом рисуется один раз в шаблон (form XObject) и
+    выводится на каждой странице ссылкой на него. Строки разбиваются по
+    страницам. В файл встраивается только подмножество глифов шрифта,
+    использованных в документе.
+    """
+
+    file_format = 'pdf'
+    content_type = 'application/pdf'
+    header_form = 'header'
+
+    def render(self):
+        lines = list(self.lines)
+        per_page = (
+            (c.PDF_FIRST_LINE_Y - c.PDF_BOTTOM_MARGIN) // c.PDF_LINE_HEIGHT
+            + 1
+        )
+        pages = max(1, ceil(len(lines) / per_page))
+        font = get_pdf_font()
+
+        buffer = BytesIO()
+        p = canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
+        self._draw_header(p, font)
+        for page in range(pages):
+            p.doForm(self.header_form)
+            p.setFont(font, c.PDF_FONT_SIZE)
+            y_position = c.PDF_FIRST_LINE_Y
+            for num, name, unit, total_amount in lines[
+                page * per_page:(page + 1) * per_page
+            ]:
+                p.drawString(
+                    100, y_position, f'{num}. {name} — {total_amount} {unit}'
+                )
+                y_position -= c.PDF_LINE_HEIGHT
+            p.setFont(font, c.PDF_FOOTER_FONT_SIZE)
+            p.drawRightString(550, 30, f'Страница {page + 1} из {pages}')
+            p.showPage()
+        p.save()
+        return buffer.getvalue()
+
+    def _draw_header(self, p, font):
+        """Отрисовка шаблона шапки страницы."""
+        p.beginForm(self.header_form)
+        p.setFont(font, c.PDF_FONT_SIZE)
+        with pdf_logo_lock:
+            p.drawImage(get_pdf_logo(), 50, 725, width=100, height=100)
+        p.drawString(250, 710, 'Список покупок')
+        p.line(50, 700, 550, 700)
+        p.endForm()
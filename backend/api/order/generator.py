@@ -0,0 +1,105 @@
+from datetime import datetime
+from functools import partial
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from rest_framework.validators import ValidationError
+
+from api.cache import export_cache_key, get_export, set_export
+from api.constants import EXPORT_DB_CHUNK_SIZE
+from api.order.exporters import EXPORTERS
+from cart.models import CartIngredient
+
+
+class OrderGenerator:
+    """Генератор заказа продуктов из корзины.
+
+    Формат выбирается по реестру экспортёров, и формируется только
+    запрошенный файл. Готовые файлы кешируются по содержимому корзины:
+    повторная выгрузка не обращается к итогам корзины и не формирует файл
+    заново, а при совпадении If-None-Match возвращается 304.
+    """
+
+    def __init__(self, cart, file_format, request=None):
+        self.cart = cart
+        self.request = request
+        self.owner = cart.owner
+        self.exporter_class = EXPORTERS.get(file_format)
+        if self.exporter_class is None:
+            raise ValidationError('Запрашиваемый формат не поддерживается')
+        self.file_name = f'Order_{self.owner}_{datetime.now()}'
+
+    def get_lines(self):
+        """Строки списка покупок с суммарным количеством ингредиентов.
+
+        Итоги заранее посчитаны в CartIngredient и читаются из базы
+        лениво, курсором на стороне сервера.
+        """
+        ingredients_sum = (
+            CartIngredient.objects.
+            filter(cart=self.cart).
+            values(
+                'ingredient__name',
+                'ingredient__measurement_unit',
+                'total_amount',
+            ).
+            order_by('ingredient__name')
+        )
+        return (
+            (i,
+             item['ingredient__name'],
+             item['ingredient__measurement_unit'],
+             item['total_amount'])
+            for i, item in enumerate(
+                ingredients_sum.iterator(chunk_size=EXPORT_DB_CHUNK_SIZE),
+                start=1
+            )
+        )
+
+    def get_cache_key(self):
+        """Ключ файла по версиям рецептов, итогам корзины и формату."""
+        return export_cache_key(
+            self.cart.recipes.values_list('pk', 'version'),
+            CartIngredient.objects.filter(
+                cart=self.cart
+            ).values_list('ingredient_id', 'total_amount'),
+            self.exporter_class.file_format,
+        )
+
+    def get_content(self):
+        """Файл целиком в байтах, из кеша или сформированный заново."""
+        key = self.get_cache_key()
+        content = get_export(key)
+        if content is None:
+            content = self.exporter_class(
+                self.get_lines(), self.file_name
+            ).render()
+            if isinstance(content, str):
+                content = content.encode(settings.DEFAULT_CHARSET)
+            set_export(key, content)
+        return content
+
+    def run_generator(self):
+        """Запуск генератора файла."""
+        key = self.get_cache_key()
+        etag = quote_etag(key)
+        response = None
+        if self.request is not None:
+            response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            content = get_export(key)
+            if content is not None:
+                response = self.exporter_class.file_response(
+                    content, self.file_name
+                )
+            else:
+                exporter = self.exporter_class(
+                    self.get_lines(), self.file_name
+                )
+                response = exporter.get_response(
+                    on_complete=partial(set_export, key)
+                )
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Authorization',))
+        return response
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from api.constants import EXPORT_JOB_TIMEOUT, EXPORT_JOB_TTL
+from api.models import ExportJob
+from api.order.generator import OrderGenerator
+
+
+def build_export(job_id):
+    """Формирование файла для задачи выгрузки списка покупок."""
+    prune_export_jobs()
+    started = ExportJob.objects.filter(
+        pk=job_id, status=ExportJob.Status.PENDING
+    ).update(status=ExportJob.Status.RUNNING)
+    if not started:
+        return
+    job = ExportJob.objects.select_related('owner__cart').get(pk=job_id)
+    try:
+        order = OrderGenerator(job.owner.cart, job.file_format)
+        content = order.get_content()
+    except Exception as error:
+        job.status = ExportJob.Status.FAILED
+        job.error = str(error)
+        job.finished_at = timezone.now()
+        job.save(update_fields=('status', 'error', 'finished_at'))
+        raise
+    job.file.save(f'{job.pk}.{job.file_format}', ContentFile(content),
+                  save=False)
+    job.status = ExportJob.Status.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=('file', 'status', 'finished_at'))
+
+
+def fail_stale_export_jobs():
+    """Пометка ошибкой задач, не завершённых за EXPORT_JOB_TIMEOUT.
+
+    Задачи выполняются в пуле потоков процесса и теряются при его
+    перезапуске, без пометки клиенты опрашивали бы их до удаления.
+    """
+    now = timezone.now()
+    return ExportJob.objects.filter(
+        status__in=(ExportJob.Status.PENDING, ExportJob.Status.RUNNING),
+        created_at__lt=now - timedelta(seconds=EXPORT_JOB_TIMEOUT),
+    ).update(
+        status=ExportJob.Status.FAILED,
+        error='Превышено время ожидания',
+        finished_at=now,
+    )
+
+
+def prune_export_jobs():
+    """Удаление устаревших задач выгрузки вместе с файлами."""
+    fail_stale_export_jobs()
+    expired = ExportJob.objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=EXPORT_JOB_TTL)
+    )
+    for job in expired:
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
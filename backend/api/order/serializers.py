@@ -0,0 +1,36 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from api.models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Сериализатор задачи выгрузки списка покупок."""
+
+    status_url = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = (
+            'id',
+            'file_format',
+            'status',
+            'error',
+            'created_at',
+            'finished_at',
+            'status_url',
+            'download_url',
+        )
+
+    def get_status_url(self, obj):
+        return self._build_url('recipes-export-job', obj)
+
+    def get_download_url(self, obj):
+        if obj.status != ExportJob.Status.DONE:
+            return None
+        return self._build_url('recipes-export-job-download', obj)
+
+    def _build_url(self, name, obj):
+        url = reverse(name, kwargs={'job_id': obj.pk})
+        return self.context['request'].build_absolute_uri(url)
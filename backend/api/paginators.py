@@ -1,6 +1,10 @@
-from rest_framework.pagination import PageNumberPagination
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor, CursorPagination,
+                                       PageNumberPagination)
 
-from api.constants import PAGE_SIZE
+from api.constants import CURSOR_POSITION_SEPARATOR, PAGE_SIZE
 
 
 class LimitSizePagination(PageNumberPagination):
@@ -8,3 +12,87 @@ class LimitSizePagination(PageNumberPagination):
 
     page_size_query_param = 'limit'
     page_size = PAGE_SIZE
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Курсорный пагинатор рецептов по ключу (pub_date, id).
+
+    Страница выбирается условием на ключ крайнего показанного рецепта,
+    без COUNT(*) и OFFSET, поэтому любая страница стоит как первая.
+    Токены next/previous непрозрачны для клиента.
+    """
+
+    page_size_query_param = 'limit'
+    page_size = PAGE_SIZE
+    ordering = ('-pub_date', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request) or Cursor(
+            offset=0, reverse=False, position=None
+        )
+        reverse = self.cursor.reverse
+        ordering = ('pub_date', 'id') if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+
+        if self.cursor.position is not None:
+            pub_date, pk = self._decode_position(self.cursor.position)
+            lookup = 'gt' if reverse else 'lt'
+            queryset = queryset.filter(
+                Q(**{f'pub_date__{lookup}': pub_date})
+                | Q(pub_date=pub_date, **{f'id__{lookup}': pk})
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = self.cursor.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor.position is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0,
+            reverse=False,
+            position=self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+        ))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0,
+            reverse=True,
+            position=self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        ))
+
+    def _get_position_from_instance(self, instance, ordering):
+        return (f'{instance.pub_date.isoformat()}'
+                f'{CURSOR_POSITION_SEPARATOR}{instance.id}')
+
+    def _decode_position(self, position):
+        """Разбор позиции курсора на дату публикации и id рецепта."""
+        try:
+            pub_date, pk = position.rsplit(CURSOR_POSITION_SEPARATOR, 1)
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk
@@ -0,0 +1,132 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, prefetch_related_objects
+from rest_framework import serializers
+
+
+class QueryPlan:
+    """План загрузки данных модели для сериализатора.
+
+    Хранит поля модели, которые нужно выбрать через only(), и вложенные
+    планы для связей: прямые связи загружаются через select_related,
+    множественные через prefetch_related.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.fields = {model._meta.pk.name}
+        self.complete = True
+        self.select = {}
+        self.prefetch = {}
+
+    def add_serializer(self, serializer, fields=None):
+        """Добавление в план всех читаемых полей сериализатора."""
+        hints = getattr(serializer, 'planner_hints', {})
+        for path in getattr(serializer, 'planner_requires', ()):
+            self.add_path(path)
+        for name, field in serializer.fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in hints:
+                    self.complete = False
+                for path in hints.get(name, ()):
+                    self.add_path(path)
+                continue
+            if field.source == '*':
+                self.complete = False
+                continue
+            nested = getattr(field, 'child', field)
+            if not isinstance(nested, serializers.BaseSerializer):
+                nested = None
+            self.add_path(field.source, nested)
+
+    def add_path(self, path, serializer=None):
+        """Добавление в план пути source вида 'relation.field'."""
+        attr, _, rest = path.partition('.')
+        try:
+            field = self.model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            self.complete = False
+            return
+        if not field.is_relation:
+            self.fields.add(field.name)
+            return
+
+        if field.many_to_many or field.one_to_many:
+            child = self.prefetch.get(attr)
+            if child is None:
+                child = self.prefetch[attr] = QueryPlan(field.related_model)
+                if field.one_to_many:
+                    child.fields.add(field.remote_field.name)
+        else:
+            child = self.select.get(attr)
+            if child is None:
+                child = self.select[attr] = QueryPlan(field.related_model)
+            if field.concrete:
+                self.fields.add(field.name)
+
+        if rest:
+            child.add_path(rest, serializer)
+        elif serializer is not None:
+            child.add_serializer(serializer)
+        else:
+            child.complete = False
+
+    def apply(self, queryset, prefetch=True, extra=()):
+        """Применение плана к набору запросов."""
+        select, only, prefetches = self._flatten()
+        if select:
+            queryset = queryset.select_related(*select)
+        if only is not None:
+            queryset = queryset.only(*only, *extra)
+        if prefetch and prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def prefetch_objects(self, instances):
+        """Подгрузка множественных связей для уже загруженных объектов."""
+        prefetches = self._flatten()[2]
+        if instances and prefetches:
+            prefetch_related_objects(instances, *prefetches)
+
+    def _flatten(self, prefix=''):
+        select, only, prefetches = [], None, []
+        if self.complete:
+            only = {f'{prefix}{name}' for name in self.fields}
+        for name, child in self.prefetch.items():
+            prefetches.append(Prefetch(
+                f'{prefix}{name}',
+                queryset=child.apply(child.model._default_manager.all())
+            ))
+        for name, child in self.select.items():
+            path = f'{prefix}{name}'
+            select.append(path)
+            child_select, child_only, child_prefetches = child._flatten(
+                f'{path}__'
+            )
+            select.extend(child_select)
+            prefetches.extend(child_prefetches)
+            if only is not None:
+                only |= child_only if child_only is not None else {path}
+        return select, only, prefetches
+
+
+@lru_cache(maxsize=None)
+def _get_plan(serializer_class, fields):
+    plan = QueryPlan(serializer_class.Meta.model)
+    plan.add_serializer(serializer_class(), fields)
+    return plan
+
+
+def get_plan(serializer_class, fields=None):
+    """План запросов для сериализатора модели.
+
+    Поля методов описываются в атрибуте сериализатора planner_hints,
+    дополнительные поля модели в planner_requires. Если для поля метода
+    подсказки нет, план не ограничивает выборку полей через only().
+    """
+    if fields is not None:
+        fields = frozenset(fields)
+    return _get_plan(serializer_class, fields)
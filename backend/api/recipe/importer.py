@@ -0,0 +1,355 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from api.constants import IMPORT_BATCH_SIZE, IMPORT_MAX_AMOUNT
+from api.fields import Base64ImageField
+from api.images import update_recipe_variants
+from api.models import RecipeShortLink
+from api.shortcodes import encode_short_code
+from api.tasks import run_in_background
+from ingredient.constants import MIN_INGREDIENTS_AMOUNT
+from ingredient.models import Ingredient, RecipeIngredient
+from recipe.constants import (LEN_RECIPE_NAME, MAX_COOKING_TIME,
+                              MIN_COOKING_TIME)
+from recipe.models import Recipe, Tag
+
+User = get_user_model()
+
+
+class RowParseError(ValueError):
+    """Ошибка разбора строки файла импорта."""
+
+
+def read_ndjson(lines):
+    """Строки NDJSON в пары (номер строки, данные рецепта)."""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as error:
+            yield line_no, RowParseError(f'Некорректный JSON: {error}')
+
+
+def read_csv(lines):
+    """Строки CSV в пары (номер строки, данные рецепта).
+
+    Теги перечисляются через ';', ингредиенты в виде 'id:количество'
+    через ';' либо JSON-списком.
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        row = {key: value for key, value in row.items() if value != ''}
+        try:
+            if 'tags' in row:
+                row['tags'] = [
+                    tag for tag in row['tags'].split(';') if tag.strip()
+                ]
+            if 'ingredients' in row:
+                row['ingredients'] = _parse_csv_ingredients(
+                    row['ingredients']
+                )
+        except ValueError as error:
+            row = RowParseError(f'Некорректная строка CSV: {error}')
+        yield reader.line_num, row
+
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+}
+
+
+def check_encoding(upload):
+    """Проверка, что загруженный файл в UTF-8, до начала импорта.
+
+    Файл читается по частям и возвращается в начало.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    try:
+        for chunk in upload.chunks():
+            decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        raise serializers.ValidationError(
+            {'file': 'Файл должен быть в кодировке UTF-8'}
+        )
+    upload.seek(0)
+
+
+@dataclass
+class ImportBatch:
+    """Результат импорта одной пачки строк."""
+
+    processed: int = 0
+    created: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+
+class RecipeImporter:
+    """Пакетный импорт рецептов.
+
+    Строки обрабатываются пачками. Для каждой пачки теги, ингредиенты и
+    авторы проверяются одним запросом на модель, а рецепты, их
+    ингредиенты, теги и короткие ссылки создаются через bulk_create.
+    Строки с ошибками пропускаются и попадают в отчёт.
+    """
+
+    def __init__(self, author=None, batch_size=IMPORT_BATCH_SIZE):
+        self.author = author
+        self.batch_size = batch_size
+        self.image_field = Base64ImageField(name='recipe')
+
+    def run(self, rows):
+        """Импорт пар (номер строки, данные); по пачке за итерацию."""
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return
+            yield self.import_batch(batch)
+
+    def import_batch(self, rows):
+        """Проверка и создание рецептов одной пачки."""
+        result = ImportBatch(processed=len(rows))
+        known = self._load_known(row for _, row in rows)
+        valid = []
+        for line_no, row in rows:
+            try:
+                valid.append((line_no, self._validate(row, known)))
+            except serializers.ValidationError as error:
+                result.errors.append({'row': line_no, 'errors': error.detail})
+        if not valid:
+            return result
+        rows = [data for _, data in valid]
+        recipes = [
+            Recipe(
+                name=data['name'],
+                text=data['text'],
+                cooking_time=data['cooking_time'],
+                author_id=data['author_id'],
+                image=data['image'],
+            ) for data in rows
+        ]
+        try:
+            with transaction.atomic():
+                self._create(recipes, rows)
+        except Exception as error:
+            self._delete_saved_images(recipes, rows)
+            result.errors.extend(
+                {'row': line_no, 'errors': [f'Ошибка сохранения: {error}']}
+                for line_no, _ in valid
+            )
+            return result
+        result.created = [recipe.pk for recipe in recipes]
+        return result
+
+    def _load_known(self, rows):
+        """Существующие id тегов, ингредиентов и авторов пачки."""
+        tag_ids, ingredient_ids, author_ids = set(), set(), set()
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            tags = row.get('tags')
+            if isinstance(tags, list):
+                tag_ids.update(_as_ids(tags))
+            ingredients = row.get('ingredients')
+            if isinstance(ingredients, list):
+                ingredient_ids.update(_as_ids(
+                    item.get('id') for item in ingredients
+                    if isinstance(item, dict)
+                ))
+            author_ids.update(_as_ids([row.get('author')]))
+        return {
+            'tags': set(Tag.objects.filter(
+                pk__in=tag_ids
+            ).values_list('pk', flat=True)),
+            'ingredients': set(Ingredient.objects.filter(
+                pk__in=ingredient_ids
+            ).values_list('pk', flat=True)),
+            'authors': set(User.objects.filter(
+                pk__in=author_ids
+            ).values_list('pk', flat=True)),
+        }
+
+    def _validate(self, row, known):
+        """Проверка строки, возвращает подготовленные данные рецепта."""
+        if isinstance(row, RowParseError):
+            raise serializers.ValidationError([str(row)])
+        if not isinstance(row, dict):
+            raise serializers.ValidationError(['Ожидается объект рецепта'])
+        errors = {}
+        data = {}
+
+        name = row.get('name')
+        if not isinstance(name, str) or not name.strip():
+            errors['name'] = 'Отсутствует название рецепта'
+        elif len(name) > LEN_RECIPE_NAME:
+            errors['name'] = f'Не более {LEN_RECIPE_NAME} символов'
+        data['name'] = name
+
+        text = row.get('text')
+        if not isinstance(text, str) or not text.strip():
+            errors['text'] = 'Необходимо описание рецепта'
+        data['text'] = text
+
+        cooking_time = _as_int(row.get('cooking_time'))
+        if cooking_time is None or not (
+            MIN_COOKING_TIME <= cooking_time <= MAX_COOKING_TIME
+        ):
+            errors['cooking_time'] = (
+                f'Время приготовления от {MIN_COOKING_TIME} '
+                f'до {MAX_COOKING_TIME} минут'
+            )
+        data['cooking_time'] = cooking_time
+
+        if row.get('author') is not None:
+            author_id = _as_int(row['author'])
+            if author_id not in known['authors']:
+                errors['author'] = 'Автор не существует'
+            data['author_id'] = author_id
+        elif self.author is not None:
+            data['author_id'] = self.author.pk
+        else:
+            errors['author'] = 'У рецепта должен быть автор'
+
+        tags = row.get('tags')
+        tag_ids = list(_as_ids(tags)) if isinstance(tags, list) else []
+        if not tag_ids or len(tag_ids) != len(tags):
+            errors['tags'] = 'Необходимо указать теги'
+        elif len(set(tag_ids)) != len(tag_ids):
+            errors['tags'] = 'Нельзя указывать одинаковые теги'
+        elif not known['tags'].issuperset(tag_ids):
+            errors['tags'] = 'Тег не существует'
+        data['tags'] = tag_ids
+
+        try:
+            data['ingredients'] = self._validate_ingredients(
+                row.get('ingredients'), known
+            )
+        except serializers.ValidationError as error:
+            errors['ingredients'] = error.detail
+
+        image = row.get('image')
+        if isinstance(image, str) and image.startswith('data:image'):
+            try:
+                data['image'] = self.image_field.run_validation(image)
+            except serializers.ValidationError as error:
+                errors['image'] = error.detail
+        elif isinstance(image, str) and image:
+            try:
+                if not Recipe.image.field.storage.exists(image):
+                    errors['image'] = 'Файл фото не найден'
+            except (SuspiciousFileOperation, ValueError):
+                errors['image'] = 'Недопустимый путь к файлу фото'
+            data['image'] = image
+        else:
+            errors['image'] = 'Отсутствует фото рецепта.'
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
+
+    def _validate_ingredients(self, ingredients, known):
+        if not isinstance(ingredients, list) or not ingredients:
+            raise serializers.ValidationError('Отсутсвуют ингредиенты')
+        amounts = {}
+        for item in ingredients:
+            if not isinstance(item, dict):
+                raise serializers.ValidationError(
+                    'Ожидается объект с id и количеством'
+                )
+            ingredient_id = _as_int(item.get('id'))
+            amount = _as_int(item.get('amount'))
+            if ingredient_id is None or amount is None:
+                raise serializers.ValidationError(
+                    'Для каждого ингрединта должен быть указан '
+                    'id и его количество в рецепте'
+                )
+            if ingredient_id not in known['ingredients']:
+                raise serializers.ValidationError('Ингредиент не существует')
+            if not MIN_INGREDIENTS_AMOUNT <= amount <= IMPORT_MAX_AMOUNT:
+                raise serializers.ValidationError(
+                    f'Количество от {MIN_INGREDIENTS_AMOUNT} '
+                    f'до {IMPORT_MAX_AMOUNT}'
+                )
+            if ingredient_id in amounts:
+                raise serializers.ValidationError(
+                    'Нельзя добавлять одинаковые ингредиенты'
+                )
+            amounts[ingredient_id] = amount
+        return amounts
+
+    def _create(self, recipes, rows):
+        """Создание рецептов пачки со связанными объектами."""
+        if connection.features.can_return_rows_from_bulk_insert:
+            Recipe.objects.bulk_create(recipes)
+            # bulk_create не отправляет post_save, копии фото ставятся
+            # в очередь явно.
+            for recipe in recipes:
+                run_in_background(update_recipe_variants, recipe.pk)
+        else:
+            for recipe in recipes:
+                recipe.save()
+
+        RecipeIngredient.objects.bulk_create(
+            RecipeIngredient(
+                recipe=recipe, ingredient_id=ingredient_id, amount=amount
+            )
+            for recipe, data in zip(recipes, rows)
+            for ingredient_id, amount in data['ingredients'].items()
+        )
+        Recipe.tags.through.objects.bulk_create(
+            Recipe.tags.through(recipe=recipe, tag_id=tag_id)
+            for recipe, data in zip(recipes, rows)
+            for tag_id in data['tags']
+        )
+        RecipeShortLink.objects.bulk_create(
+            RecipeShortLink(
+                recipe=recipe, short_code=encode_short_code(recipe.pk)
+            )
+            for recipe in recipes
+        )
+
+    def _delete_saved_images(self, recipes, rows):
+        """Удаление фото из Base64, сохранённых отменённой пачкой."""
+        for recipe, data in zip(recipes, rows):
+            if not isinstance(data['image'], str) and recipe.image._committed:
+                recipe.image.delete(save=False)
+
+
+def _parse_csv_ingredients(value):
+    value = value.strip()
+    if value.startswith('['):
+        return json.loads(value)
+    ingredients = []
+    for item in value.split(';'):
+        if not item.strip():
+            continue
+        ingredient_id, amount = item.split(':')
+        ingredients.append({'id': ingredient_id, 'amount': amount})
+    return ingredients
+
+
+def _as_int(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_ids(values):
+    for value in values:
+        value = _as_int(value)
+        if value is not None:
+            yield value
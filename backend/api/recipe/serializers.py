@@ -1,12 +1,21 @@
+import json
+
 from django.core.validators import FileExtensionValidator
+from django.db import transaction
 from rest_framework import serializers
 
 from api import constants as c
-from api.fields import Base64ImageField
+from api.cache import (get_recipe_fragments, recipe_fragment_key,
+                       set_recipe_fragments)
+from api.fields import Base64ImageField, ImageVariantsField
+from api.mixins import SparseFieldsSerializerMixin
+from api.planner import get_plan
 from api.users.serializers import UserSerializer
 from api.validators import PhotoValidator, RecipeDataValidator
+from cart.models import CartIngredient
 from ingredient.models import RecipeIngredient
 from recipe.models import Recipe, Tag
+from recipe.signals import ingredient_changes_without_bump
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -32,8 +41,26 @@ class RecipeIngredientSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'measurement_unit', 'amount',)
 
 
-class RecipeReadSerializer(serializers.ModelSerializer):
-    """Сериализатор чтения рецепта."""
+class RecipeListSerializer(serializers.ListSerializer):
+    """Сериализатор списка рецептов с пакетным чтением кеша фрагментов."""
+
+    def to_representation(self, data):
+        recipes = list(data.all() if hasattr(data, 'all') else data)
+        return self.child.to_representation_many(recipes)
+
+
+class RecipeReadSerializer(SparseFieldsSerializerMixin,
+                           serializers.ModelSerializer):
+    """Сериализатор чтения рецепта.
+
+    Общая для всех пользователей часть представления кешируется по id и
+    версии рецепта, поверх неё накладываются только флаги текущего
+    пользователя. Связи рецепта подгружаются лишь для промахов кеша.
+    Выборка полей через ?fields= / ?omit= обходит кеш.
+    """
+
+    planner_hints = {'is_favorited': (), 'is_in_shopping_cart': ()}
+    planner_requires = ('version',)
 
     tags = TagSerializer(many=True)
     author = UserSerializer()
@@ -41,6 +68,7 @@ class RecipeReadSerializer(serializers.ModelSerializer):
     is_in_shopping_cart = serializers.SerializerMethodField()
     ingredients = RecipeIngredientSerializer(many=True,
                                              source='recipe_ingredients')
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Recipe
@@ -53,21 +81,72 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             'is_in_shopping_cart',
             'name',
             'image',
+            'image_variants',
             'text',
             'cooking_time',
         )
         read_only_fields = fields
+        list_serializer_class = RecipeListSerializer
+
+    def to_representation(self, instance):
+        return self.to_representation_many([instance])[0]
+
+    def to_representation_many(self, recipes):
+        """Представление набора рецептов через кеш фрагментов."""
+        sparse_fields = self.context.get('sparse_fields')
+        if sparse_fields is not None:
+            get_plan(type(self), sparse_fields).prefetch_objects(recipes)
+            represent = super().to_representation
+            return [represent(recipe) for recipe in recipes]
+
+        request = self.context.get('request')
+        keys = {
+            recipe.id: recipe_fragment_key(recipe, request)
+            for recipe in recipes
+        }
+        fragments = get_recipe_fragments(list(keys.values()))
+        missed = [
+            recipe for recipe in recipes if keys[recipe.id] not in fragments
+        ]
+        if missed:
+            get_plan(type(self)).prefetch_objects(missed)
+            fresh = {}
+            for recipe in missed:
+                fresh[keys[recipe.id]] = super().to_representation(recipe)
+            set_recipe_fragments(fresh)
+            fragments.update(fresh)
+        return [
+            self._with_user_flags(recipe, fragments[keys[recipe.id]])
+            for recipe in recipes
+        ]
+
+    def _with_user_flags(self, recipe, fragment):
+        """Наложение флагов текущего пользователя на общий фрагмент."""
+        data = fragment.copy()
+        data['is_favorited'] = self.get_is_favorited(recipe)
+        data['is_in_shopping_cart'] = self.get_is_in_shopping_cart(recipe)
+        data['author'] = fragment['author'].copy()
+        data['author']['is_subscribed'] = (
+            self.fields['author'].get_is_subscribed(recipe.author)
+        )
+        return data
 
     def get_is_favorited(self, obj: Recipe):
         user = self.context.get('request').user
         if user.is_anonymous:
             return False
+        annotated = getattr(obj, 'is_favorited', None)
+        if annotated is not None:
+            return annotated
         return obj.favorited_by.filter(id=user.id).exists()
 
     def get_is_in_shopping_cart(self, obj):
         user = self.context.get('request').user
         if user.is_anonymous:
             return False
+        annotated = getattr(obj, 'is_in_shopping_cart', None)
+        if annotated is not None:
+            return annotated
         return user.cart.recipes.filter(id=obj.id).exists()
 
 
@@ -99,7 +178,7 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         )
 
     def validate(self, attrs):
-        attrs['ingredients'] = self.initial_data.get('ingredients')
+        attrs['ingredients'] = self._get_ingredients_data()
         attrs['author'] = self.context.get('request').user
         attrs['request'] = self.context.get('request')
         try:
@@ -114,39 +193,117 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         validator()
         return attrs
 
+    def _get_ingredients_data(self):
+        """Ингредиенты из запроса.
+
+        В JSON ингредиенты передаются списком, в multipart/form-data
+        строкой с JSON-списком.
+        """
+        ingredients = self.initial_data.get('ingredients')
+        if isinstance(ingredients, str):
+            try:
+                ingredients = json.loads(ingredients)
+            except ValueError:
+                raise serializers.ValidationError(
+                    {'ingredients': 'Ожидается список ингредиентов в JSON'}
+                )
+        return ingredients
+
+    @transaction.atomic
     def create(self, validated_data):
         """Cоздание нового рецепта."""
         try:
-            recipe = Recipe.objects.create(validated_data)
+            recipe = Recipe.objects.create(validated_data, validated=True)
         except Exception as e:
             raise serializers.ValidationError(
                 f'Ошибка: {e}'
             )
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
-        tags_data = validated_data.pop('tags', None)
-        ingredients_data = validated_data.pop('ingredients', None)
+        """Обновление рецепта.
+
+        Теги и ингредиенты меняются без увеличения версии на каждую
+        строку, версия рецепта увеличивается один раз при сохранении
+        самого рецепта в конце. Если сохранение не удалось, изменения
+        тегов и ингредиентов откатываются.
+        """
         if validated_data['image'] is None:
             del validated_data['image']
+        self._update_tags(instance, validated_data.pop('tags'))
+        ingredients_changed = self._update_recipeingredients(
+            instance, validated_data.pop('ingredients')
+        )
         instance = super().update(instance, validated_data)
-        instance.tags.set(tags_data)
-        self._update_recipeingredients(instance, ingredients_data)
+        if ingredients_changed:
+            CartIngredient.objects.rebuild_for_recipe(instance)
 
         return instance
 
+    def _update_tags(self, recipe, tags):
+        """Обновление тегов рецепта через промежуточную модель."""
+        through = Recipe.tags.through
+        current = set(
+            through.objects.filter(recipe=recipe).
+            values_list('tag_id', flat=True)
+        )
+        tag_ids = {tag.pk for tag in tags}
+        if current - tag_ids:
+            through.objects.filter(
+                recipe=recipe, tag_id__in=current - tag_ids
+            ).delete()
+        if tag_ids - current:
+            through.objects.bulk_create(
+                through(recipe=recipe, tag_id=tag_id)
+                for tag_id in tag_ids - current
+            )
+
     def _update_recipeingredients(self, recipe, ingredients_data):
-        """Метод для обновления ингредентов рецепта."""
+        """Метод для обновления ингредентов рецепта.
 
-        RecipeIngredient.objects.filter(recipe=recipe).delete()
+        Изменяются только отличающиеся строки: удалённые ингредиенты
+        удаляются, у изменённых обновляется количество, новые создаются.
+        Возвращает True, если состав рецепта изменился.
+        """
+        current = {
+            recipe_ingredient.ingredient_id: recipe_ingredient
+            for recipe_ingredient in RecipeIngredient.objects.filter(
+                recipe=recipe
+            )
+        }
+        amounts = {
+            int(values.get('id')): int(values.get('amount'))
+            for values in ingredients_data
+        }
+        removed = [
+            recipe_ingredient.pk
+            for ingredient_id, recipe_ingredient in current.items()
+            if ingredient_id not in amounts
+        ]
+        changed = []
+        created = []
+        for ingredient_id, amount in amounts.items():
+            recipe_ingredient = current.get(ingredient_id)
+            if recipe_ingredient is None:
+                created.append(RecipeIngredient(
+                    recipe=recipe,
+                    ingredient_id=ingredient_id,
+                    amount=amount
+                ))
+            elif recipe_ingredient.amount != amount:
+                recipe_ingredient.amount = amount
+                changed.append(recipe_ingredient)
 
-        RecipeIngredient.objects.bulk_create(
-            RecipeIngredient(
-                recipe=recipe,
-                ingredient_id=values.get('id'),
-                amount=values.get('amount')
-            ) for values in ingredients_data
-        )
+        if removed:
+            # Версия рецепта увеличивается один раз при его сохранении.
+            with ingredient_changes_without_bump():
+                RecipeIngredient.objects.filter(pk__in=removed).delete()
+        if changed:
+            RecipeIngredient.objects.bulk_update(changed, ('amount',))
+        if created:
+            RecipeIngredient.objects.bulk_create(created)
+        return bool(removed or changed or created)
 
     def to_representation(self, instance):
         return RecipeReadSerializer(instance, context=self.context).data
@@ -155,11 +312,14 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 class RecipeStripSerializer(serializers.ModelSerializer):
     """Сериализвтор для рецепта с ограниченным выводом данных."""
 
+    image_variants = ImageVariantsField()
+
     class Meta:
         model = Recipe
         fields = (
             'id',
             'name',
             'image',
+            'image_variants',
             'cooking_time',
         )
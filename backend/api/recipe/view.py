@@ -1,22 +1,36 @@
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
+from api.constants import (CURSOR_PAGINATION_PARAM, EXPORT_ASYNC_PARAM,
+                           IMPORT_FORMAT_PARAM)
 from api.filters import RecipeFilter
-from api.models import RecipeShortLink
-from api.paginators import LimitSizePagination
+from api.mixins import ConditionalGetMixin, SparseFieldsMixin
+from api.models import ExportJob, RecipeShortLink
+from api.order.exporters import EXPORTERS
+from api.order.generator import OrderGenerator
+from api.order.jobs import build_export, fail_stale_export_jobs
+from api.order.serializers import ExportJobSerializer
+from api.paginators import LimitSizePagination, RecipeCursorPagination
 from api.permissions import IsAuthorOrReadOnly
+from api.planner import get_plan
+from api.recipe.importer import READERS, RecipeImporter, check_encoding
 from api.recipe.serializers import (RecipeCreateUpdateSerializer,
                                     RecipeReadSerializer, TagSerializer)
-from api.utils import (CartResponseGenerator, FavoriteResponseGenerator,
-                       OrderGenerator)
+from api.tasks import run_in_background
+from api.users.utils import get_subscription_ids
+from api.utils import CartResponseGenerator, FavoriteResponseGenerator
 from recipe.models import Recipe, Tag
 
 
-class TagViewSet(ReadOnlyModelViewSet):
+class TagViewSet(ConditionalGetMixin, ReadOnlyModelViewSet):
     """Вьюсет для Тегов."""
 
     queryset = Tag.objects.all()
@@ -25,15 +39,20 @@ class TagViewSet(ReadOnlyModelViewSet):
     pagination_class = None
 
 
-class RecipeVievSet(ModelViewSet):
+class RecipeVievSet(ConditionalGetMixin, SparseFieldsMixin, ModelViewSet):
     """Вьюсет для рецептов"""
 
     queryset = Recipe.objects.all()
+    read_actions = ('list', 'retrieve', 'trending')
+    conditional_actions = ('retrieve',)
+    sparse_actions = read_actions
     pagination_class = LimitSizePagination
+    cursor_pagination_class = RecipeCursorPagination
     serializer_class = RecipeReadSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
+    parser_classes = (JSONParser, FormParser, MultiPartParser)
     permissions_actions = {
         'create': [IsAuthenticated],
         'update': [IsAuthenticated, IsAuthorOrReadOnly],
@@ -41,7 +60,10 @@ class RecipeVievSet(ModelViewSet):
         'destroy': [IsAuthenticated, IsAuthorOrReadOnly],
         'add_delete_cart_recipes': [IsAuthenticated],
         'get_order': [IsAuthenticated],
+        'export_job': [IsAuthenticated],
+        'export_job_download': [IsAuthenticated],
         'favorites': [IsAuthenticated],
+        'import_recipes': [IsAdminUser],
     }
 
     def get_permissions(self):
@@ -51,12 +73,57 @@ class RecipeVievSet(ModelViewSet):
             permission_classes = [AllowAny]
         return [permissions() for permissions in permission_classes]
 
+    @property
+    def paginator(self):
+        """Курсорная пагинация включается параметром ?pagination=cursor."""
+        if not hasattr(self, '_paginator') and self._use_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+    def _use_cursor_pagination(self):
+        query_params = self.request.query_params
+        return self.action == 'list' and (
+            query_params.get(CURSOR_PAGINATION_PARAM) == 'cursor'
+            or self.cursor_pagination_class.cursor_query_param in query_params
+        )
+
     def get_queryset(self):
-        return Recipe.objects.all().select_related(
-            'author').prefetch_related('tags', 'ingredients')
+        queryset = Recipe.objects.with_user_flags(self.request.user)
+        if self.action in self.read_actions:
+            # Связи подгружает сериализатор, только для промахов кеша.
+            plan = get_plan(
+                self.get_serializer_class(), self.get_sparse_fields()
+            )
+            return plan.apply(
+                queryset,
+                prefetch=False,
+                extra=('author', 'pub_date')
+            )
+        return queryset.select_related('author')
+
+    def get_object(self):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def get_conditional_etag(self):
+        """ETag рецепта: версия и флаги текущего пользователя."""
+        recipe = self.get_object()
+        flags = (
+            recipe.is_favorited,
+            recipe.is_in_shopping_cart,
+            recipe.author_id in get_subscription_ids(self.request),
+        )
+        return '-'.join(
+            str(value) for value in (recipe.id, recipe.version, *flags)
+        )
+
+    def get_conditional_last_modified(self):
+        """Last-Modified не отдаётся: флаги ответа зависят от пользователя."""
+        return None
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in self.read_actions:
             return RecipeReadSerializer
         return RecipeCreateUpdateSerializer
 
@@ -75,16 +142,26 @@ class RecipeVievSet(ModelViewSet):
     )
     def get_link(self, request, pk=None):
         recipe = self.get_object()
-        link, create = RecipeShortLink.objects.get_or_create(
-            recipe=recipe,
-        )
-        if create:
-            link.save()
+        link, _ = RecipeShortLink.objects.get_or_create(recipe=recipe)
         short_link = link.get_short_url(request)
         return Response(
             {'short-link': f'{short_link}'}, status=status.HTTP_200_OK
         )
 
+    @action(
+        methods=['get'],
+        detail=False,
+        url_path='trending'
+    )
+    def trending(self, request):
+        """Популярные рецепты по заранее рассчитанной оценке."""
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            trending_score__isnull=False
+        ).order_by('-trending_score__score', '-pub_date')
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(
         methods=['get'],
         detail=False,
@@ -94,10 +171,90 @@ class RecipeVievSet(ModelViewSet):
         file_format = request.query_params.get('file_format', 'pdf').lower()
         cart = request.user.cart
         if request.method == 'GET':
-            order = OrderGenerator(cart=cart, file_format=file_format)
+            order = OrderGenerator(
+                cart=cart, file_format=file_format, request=request
+            )
+            if request.query_params.get(EXPORT_ASYNC_PARAM) in ('1', 'true'):
+                job = ExportJob.objects.create(
+                    owner=request.user, file_format=file_format
+                )
+                run_in_background(build_export, job.pk)
+                serializer = ExportJobSerializer(
+                    job, context=self.get_serializer_context()
+                )
+                return Response(
+                    serializer.data, status=status.HTTP_202_ACCEPTED
+                )
             response = order.run_generator()
             return response
 
+    @action(
+        methods=['get'],
+        detail=False,
+        url_path=r'download_shopping_cart/jobs/(?P<job_id>[0-9a-f-]{36})'
+    )
+    def export_job(self, request, job_id=None):
+        fail_stale_export_jobs()
+        job = get_object_or_404(ExportJob, pk=job_id, owner=request.user)
+        serializer = ExportJobSerializer(
+            job, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
+    @action(
+        methods=['get'],
+        detail=False,
+        url_path=(
+            r'download_shopping_cart/jobs/(?P<job_id>[0-9a-f-]{36})/download'
+        )
+    )
+    def export_job_download(self, request, job_id=None):
+        job = get_object_or_404(ExportJob, pk=job_id, owner=request.user)
+        if job.status != ExportJob.Status.DONE:
+            raise ValidationError('Файл ещё не готов')
+        exporter_class = EXPORTERS[job.file_format]
+        return FileResponse(
+            job.file.open('rb'),
+            as_attachment=True,
+            filename=(
+                f'Order_{job.owner}_{job.created_at}.{job.file_format}'
+            ),
+            content_type=exporter_class.content_type,
+        )
+
+    @action(
+        methods=['post'],
+        detail=False,
+        parser_classes=[MultiPartParser],
+        url_path='import'
+    )
+    def import_recipes(self, request):
+        upload = request.data.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'Обязательное поле'})
+        file_format = (
+            request.query_params.get(IMPORT_FORMAT_PARAM)
+            or upload.name.rsplit('.', 1)[-1]
+        ).lower()
+        reader = READERS.get(file_format)
+        if reader is None:
+            raise ValidationError('Формат файла не поддерживается')
+
+        check_encoding(upload)
+        lines = (line.decode('utf-8-sig') for line in upload)
+        processed, created, errors = 0, [], []
+        for batch in RecipeImporter(author=request.user).run(reader(lines)):
+            processed += batch.processed
+            created.extend(batch.created)
+            errors.extend(batch.errors)
+        return Response(
+            {'processed': processed, 'created': created, 'errors': errors},
+            status=(
+                status.HTTP_201_CREATED if created
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
     @action(
         methods=['post', 'delete'],
         detail=True,
@@ -0,0 +1,71 @@
+import string
+
+from api.constants import (LEGACY_LENGTH_SHORT_CODE, MAX_LENGTH_SHORT_CODE,
+                           MIN_LENGTH_SHORT_CODE, SHORT_CODE_MULTIPLIER,
+                           SHORT_CODE_OFFSET)
+
+ALPHABET = string.digits + string.ascii_letters
+BASE = len(ALPHABET)
+
+
+def encode_short_code(number):
+    """Короткий код для положительного числа (id рецепта).
+
+    Числа нумеруют коды подряд: сначала все коды минимальной длины, затем
+    на символ длиннее и так далее. Внутри одной длины номер перемешивается
+    взаимно однозначной перестановкой (умножение на число, взаимно
+    простое с основанием, и сдвиг по модулю), поэтому соседние рецепты
+    получают непохожие коды, а разные числа не дают одинаковых кодов.
+    """
+    if number < 1:
+        raise ValueError('Номер должен быть положительным')
+    index = number - 1
+    length = MIN_LENGTH_SHORT_CODE
+    while index >= BASE ** length:
+        index -= BASE ** length
+        length += 1
+    size = BASE ** length
+    value = (index * SHORT_CODE_MULTIPLIER + SHORT_CODE_OFFSET) % size
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, BASE)
+        chars.append(ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def decode_short_code(code):
+    """Число, из которого получен короткий код, или None.
+
+    None возвращается для кодов другой длины или с другими символами,
+    в том числе для трёхсимвольных кодов, выданных ранее случайно, а
+    также для строк, которые encode_short_code не выдаёт.
+    """
+    length = len(code)
+    if not MIN_LENGTH_SHORT_CODE <= length <= MAX_LENGTH_SHORT_CODE or any(
+        char not in ALPHABET for char in code
+    ):
+        return None
+    value = 0
+    for char in code:
+        value = value * BASE + ALPHABET.index(char)
+    size = BASE ** length
+    index = (
+        (value - SHORT_CODE_OFFSET) * pow(SHORT_CODE_MULTIPLIER, -1, size)
+    ) % size
+    for shorter in range(MIN_LENGTH_SHORT_CODE, length):
+        index += BASE ** shorter
+    number = index + 1
+    if encode_short_code(number) != code:
+        return None
+    return number
+
+
+def is_short_code(code):
+    """Может ли строка быть кодом короткой ссылки.
+
+    Подходят коды, полученные encode_short_code, и трёхсимвольные коды,
+    выданные ранее случайно.
+    """
+    if len(code) == LEGACY_LENGTH_SHORT_CODE:
+        return all(char in ALPHABET for char in code)
+    return decode_short_code(code) is not None
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import delete_short_link_path
+from api.images import (needs_variants, update_avatar_variants,
+                        update_recipe_variants)
+from api.models import RecipeShortLink
+from api.tasks import run_in_background
+from recipe.models import Recipe
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_saved(sender, instance, **kwargs):
+    """Создание копий нового фото рецепта в фоне."""
+    if needs_variants(instance.image, instance.image_variants):
+        run_in_background(update_recipe_variants, instance.pk)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """Создание копий нового аватара пользователя в фоне."""
+    if needs_variants(instance.avatar, instance.image_variants):
+        run_in_background(update_avatar_variants, instance.pk)
+
+
+@receiver(post_save, sender=RecipeShortLink)
+@receiver(post_delete, sender=RecipeShortLink)
+def short_link_changed(sender, instance, **kwargs):
+    """Удаление короткой ссылки из кеша после её изменения или удаления.
+
+    Кеш очищается после фиксации транзакции, иначе параллельный переход
+    по ссылке успел бы снова записать в кеш ещё видимую строку.
+    """
+    short_code = instance.short_code
+    transaction.on_commit(lambda: delete_short_link_path(short_code))
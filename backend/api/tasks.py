@@ -0,0 +1,37 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    """Пул фоновых потоков процесса."""
+    return ThreadPoolExecutor(
+        max_workers=settings.BACKGROUND_WORKERS,
+        thread_name_prefix='background',
+    )
+
+
+def run_in_background(func, *args, **kwargs):
+    """Запуск функции в фоновом потоке после фиксации транзакции.
+
+    Задачи выполняются вне цикла запрос-ответ, поэтому не занимают
+    воркер сервера приложений.
+    """
+    transaction.on_commit(
+        lambda: get_executor().submit(_run, func, args, kwargs)
+    )
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Ошибка фоновой задачи %s', func.__name__)
+    finally:
+        connection.close()
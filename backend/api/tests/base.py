@@ -0,0 +1,107 @@
+import base64
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APIClient, APITestCase
+
+from api.cache import short_links
+from ingredient.models import Ingredient
+from recipe.models import Recipe, Tag
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_base64(size=(20, 20)):
+    """Картинка PNG в виде data URI."""
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'PNG')
+    return (
+        'data:image/png;base64,'
+        + base64.b64encode(buffer.getvalue()).decode()
+    )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class FoodgramTestCase(APITestCase):
+    """Общие данные тестов API: пользователи, теги и ингредиенты."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = cls.create_user('author')
+        cls.reader = cls.create_user('reader')
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {num}', slug=f'tag{num}')
+            for num in range(3)
+        ]
+        cls.ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {num}', measurement_unit='г'
+            ) for num in range(5)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        short_links.clear()
+
+    @staticmethod
+    def create_user(username):
+        return User.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='password',
+            first_name=username,
+            last_name=username,
+        )
+
+    def client_for(self, user=None):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client
+
+    def recipe_data(self, tags=None, ingredients=None, **kwargs):
+        data = {
+            'name': 'Рецепт',
+            'text': 'Описание',
+            'cooking_time': 10,
+            'tags': [tag.pk for tag in tags or self.tags[:2]],
+            'ingredients': [
+                {'id': ingredient.pk, 'amount': amount}
+                for ingredient, amount in (
+                    ingredients or zip(self.ingredients[:3], (10, 20, 30))
+                )
+            ],
+            'image': image_base64(),
+        }
+        data.update(kwargs)
+        return data
+
+    def create_recipe(self, author=None, **kwargs):
+        response = self.client_for(author or self.author).post(
+            '/api/recipes/', self.recipe_data(**kwargs), format='json'
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return Recipe.objects.get(pk=response.data['id'])
+
+    @staticmethod
+    def make_recipe(author, name='Рецепт', **kwargs):
+        """Рецепт без запроса к API и без загрузки фото."""
+        recipe = Recipe(
+            name=name, author=author, text='Описание', cooking_time=10,
+            image='recipes/foto/recipe.png', **kwargs
+        )
+        recipe.save()
+        return recipe
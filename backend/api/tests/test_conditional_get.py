@@ -0,0 +1,102 @@
+from django.utils.http import http_date, parse_http_date
+
+from api.tests.base import FoodgramTestCase
+from ingredient.models import Ingredient
+from recipe.models import Tag
+
+
+class ConditionalGetTest(FoodgramTestCase):
+    """Ответы 304 на условные GET-запросы."""
+
+    def test_tags_not_modified(self):
+        client = self.client_for()
+        response = client.get('/api/tags/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(1):
+            response = client.get(
+                '/api/tags/', HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleting_newest_tag_changes_etag(self):
+        client = self.client_for()
+        etag = client.get('/api/tags/')['ETag']
+        Tag.objects.create(name='Новый', slug='new')
+        client.get('/api/tags/')
+
+        Tag.objects.get(slug='new').delete()
+        Tag.objects.filter(pk=self.tags[0].pk).delete()
+
+        response = client.get('/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), len(self.tags) - 1)
+
+    def test_ingredients_not_modified_since(self):
+        client = self.client_for()
+        last_modified = client.get('/api/ingredients/')['Last-Modified']
+
+        response = client.get(
+            '/api/ingredients/', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['Last-Modified'], last_modified)
+
+        Ingredient.objects.create(name='Соль', measurement_unit='г')
+        response = client.get(
+            '/api/ingredients/', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_last_modified_moves_forward_on_delete(self):
+        client = self.client_for()
+        Tag.objects.create(name='Новый', slug='new')
+        last_modified = client.get('/api/tags/')['Last-Modified']
+
+        Tag.objects.get(slug='new').delete()
+
+        response = client.get(
+            '/api/tags/', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(
+            parse_http_date(response['Last-Modified']),
+            parse_http_date(last_modified),
+        )
+
+    def test_each_change_moves_last_modified(self):
+        client = self.client_for()
+        last_modified = client.get('/api/tags/')['Last-Modified']
+
+        self.tags[0].save()
+
+        response = client.get(
+            '/api/tags/', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_recipe_has_no_last_modified(self):
+        recipe = self.create_recipe()
+
+        response = self.client_for(self.reader).get(
+            f'/api/recipes/{recipe.pk}/', HTTP_IF_MODIFIED_SINCE=http_date()
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_recipe_not_modified_until_user_flags_change(self):
+        recipe = self.create_recipe()
+        client = self.client_for(self.reader)
+        url = f'/api/recipes/{recipe.pk}/'
+        etag = client.get(url)['ETag']
+
+        with self.assertNumQueries(2):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.reader.favourites.add(recipe)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_favorited'])
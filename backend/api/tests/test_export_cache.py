@@ -0,0 +1,84 @@
+import pickle
+
+from django.test import SimpleTestCase
+
+from api.cache import SizeLimitedLocMemCache
+from api.tests.base import FoodgramTestCase
+from cart.models import CartIngredient
+
+URL = '/api/recipes/download_shopping_cart/'
+
+
+class SizeLimitedLocMemCacheTest(SimpleTestCase):
+    """Кеш файлов ограничен суммарным размером значений."""
+
+    def setUp(self):
+        self.cache = SizeLimitedLocMemCache(
+            'test-exports', {'OPTIONS': {'MAX_SIZE': 3000}}
+        )
+        self.cache.clear()
+
+    def stored_size(self):
+        return sum(len(value) for value in self.cache._cache.values())
+
+    def test_evicts_least_recently_used(self):
+        for num in range(5):
+            self.cache.set(f'file{num}', b'x' * 1000)
+            self.cache.get('file0')
+
+        self.assertLessEqual(self.stored_size(), 3000)
+        self.assertIsNotNone(self.cache.get('file0'))
+        self.assertIsNotNone(self.cache.get('file4'))
+        self.assertIsNone(self.cache.get('file1'))
+
+    def test_value_larger_than_limit_is_not_kept(self):
+        self.cache.set('small', b'x' * 100)
+        self.cache.set('huge', b'x' * 4000)
+
+        self.assertIsNone(self.cache.get('huge'))
+        self.assertLessEqual(self.stored_size(), 3000)
+
+    def test_size_counts_pickled_values(self):
+        self.cache.set('file', b'x' * 1000)
+
+        self.assertEqual(
+            self.stored_size(),
+            len(pickle.dumps(b'x' * 1000, pickle.HIGHEST_PROTOCOL)),
+        )
+
+
+class ExportCacheKeyTest(FoodgramTestCase):
+    """Ключ кеша файла зависит от итогов корзины."""
+
+    def setUp(self):
+        super().setUp()
+        self.recipe = self.make_recipe(self.author)
+        self.recipe.recipe_ingredients.create(
+            ingredient=self.ingredients[0], amount=100
+        )
+        self.reader.cart.recipes.add(self.recipe)
+        self.client = self.client_for(self.reader)
+
+    def download(self, **headers):
+        return self.client.get(URL, {'file_format': 'txt'}, **headers)
+
+    def test_repeat_download_not_modified(self):
+        etag = self.download()['ETag']
+
+        response = self.download(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_totals_change_without_version_bump(self):
+        response = self.download()
+        content = b''.join(response.streaming_content)
+        CartIngredient.objects.filter(cart=self.reader.cart).update(
+            total_amount=250
+        )
+
+        response = self.download(HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+        fresh = b''.join(response.streaming_content)
+        self.assertNotEqual(fresh, content)
+        self.assertIn('250', fresh.decode())
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from api.constants import EXPORT_JOB_TIMEOUT
+from api.models import ExportJob
+from api.order.jobs import build_export
+from api.tests.base import FoodgramTestCase
+
+URL = '/api/recipes/download_shopping_cart/'
+
+
+class ExportJobTest(FoodgramTestCase):
+    """Фоновые выгрузки списка покупок."""
+
+    def setUp(self):
+        super().setUp()
+        recipe = self.make_recipe(self.author)
+        recipe.recipe_ingredients.create(
+            ingredient=self.ingredients[0], amount=100
+        )
+        self.reader.cart.recipes.add(recipe)
+        self.client = self.client_for(self.reader)
+
+    def create_job(self, age=0, **kwargs):
+        job = ExportJob.objects.create(
+            owner=self.reader, file_format='txt', **kwargs
+        )
+        ExportJob.objects.filter(pk=job.pk).update(
+            created_at=timezone.now() - timedelta(seconds=age)
+        )
+        return job
+
+    def status(self, job):
+        response = self.client.get(f'{URL}jobs/{job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_async_request_creates_job(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.get(URL, {'file_format': 'txt', 'async': 1})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], ExportJob.Status.PENDING)
+        self.assertIsNone(response.data['download_url'])
+        self.assertEqual(len(callbacks), 1)
+
+    def test_build_export(self):
+        job = self.create_job()
+
+        build_export(job.pk)
+
+        data = self.status(job)
+        self.assertEqual(data['status'], ExportJob.Status.DONE)
+        response = self.client.get(data['download_url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Ингредиент 0', b''.join(response).decode())
+
+    def test_stale_job_is_failed_on_poll(self):
+        job = self.create_job(age=EXPORT_JOB_TIMEOUT + 1)
+        fresh = self.create_job()
+
+        self.assertEqual(self.status(job)['status'], ExportJob.Status.FAILED)
+        self.assertEqual(
+            self.status(fresh)['status'], ExportJob.Status.PENDING
+        )
+
+    def test_stale_running_job_is_failed_on_prune(self):
+        job = self.create_job(
+            age=EXPORT_JOB_TIMEOUT + 1, status=ExportJob.Status.RUNNING
+        )
+
+        build_export(self.create_job().pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job_is_not_built(self):
+        job = self.create_job(status=ExportJob.Status.FAILED)
+
+        build_export(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+        self.assertFalse(job.file)
@@ -0,0 +1,55 @@
+import base64
+import textwrap
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from PIL import Image
+from rest_framework.serializers import ValidationError
+
+from api.fields import Base64ImageField
+
+
+def png_bytes(size=(40, 40)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class Base64ImageFieldTest(SimpleTestCase):
+    """Проверка размера Base64-изображения до декодирования."""
+
+    def setUp(self):
+        self.content = png_bytes()
+        self.encoded = base64.b64encode(self.content).decode()
+
+    def field(self, max_size):
+        return Base64ImageField(name='recipe', max_size=max_size)
+
+    def test_wrapped_base64_at_limit(self):
+        data = 'data:image/png;base64,' + '\r\n'.join(
+            textwrap.wrap(self.encoded, 76)
+        ) + '\r\n'
+
+        file = self.field(len(self.content)).to_internal_value(data)
+
+        self.assertEqual(file.size, len(self.content))
+        self.assertEqual(file.read(), self.content)
+
+    def test_over_limit_rejected_before_decoding(self):
+        data = 'data:image/png;base64,' + '\n'.join(
+            textwrap.wrap(self.encoded, 76)
+        )
+        field = self.field(len(self.content) - 1)
+
+        with self.assertRaisesMessage(ValidationError, 'Максимальный'):
+            field.to_internal_value(data)
+
+    def test_decoded_size_without_whitespace(self):
+        field = self.field(len(self.content))
+        for length in range(1, 5):
+            encoded = base64.b64encode(b'x' * length).decode()
+            self.assertEqual(field._decoded_size(encoded, 0), length)
+
+    def test_missing_base64_marker(self):
+        with self.assertRaisesMessage(ValidationError, 'Base64'):
+            self.field(1024).to_internal_value('data:image/png,abc')
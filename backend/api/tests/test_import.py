@@ -0,0 +1,112 @@
+import json
+import os
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+
+from api.models import RecipeShortLink
+from api.tests.base import MEDIA_ROOT, FoodgramTestCase, image_base64
+from recipe.models import Recipe
+
+URL = '/api/recipes/import/'
+
+
+class RecipeImportTest(FoodgramTestCase):
+    """Пакетный импорт рецептов из файла."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.create_user('admin')
+        self.admin.is_staff = True
+        self.admin.save()
+        self.client = self.client_for(self.admin)
+
+    def row(self, **kwargs):
+        data = {
+            'name': 'Импорт',
+            'text': 'Описание',
+            'cooking_time': 15,
+            'tags': [self.tags[0].pk],
+            'ingredients': [{'id': self.ingredients[0].pk, 'amount': 10}],
+            'image': image_base64(),
+        }
+        data.update(kwargs)
+        return json.dumps(data, ensure_ascii=False)
+
+    def upload(self, content, name='recipes.ndjson'):
+        if isinstance(content, str):
+            content = content.encode()
+        return self.client.post(
+            URL, {'file': SimpleUploadedFile(name, content)},
+            format='multipart',
+        )
+
+    def test_error_rows_are_reported(self):
+        content = '\n'.join((
+            self.row(),
+            self.row(image='../../../etc/passwd'),
+            '{"name": ',
+            self.row(tags=[]),
+        ))
+
+        response = self.upload(content)
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['processed'], 4)
+        self.assertEqual(len(response.data['created']), 1)
+        self.assertEqual(
+            [error['row'] for error in response.data['errors']], [2, 3, 4]
+        )
+        self.assertIn('image', response.data['errors'][0]['errors'])
+        self.assertIn('tags', response.data['errors'][2]['errors'])
+        recipe = Recipe.objects.get(pk=response.data['created'][0])
+        self.assertEqual(recipe.author, self.admin)
+        self.assertTrue(
+            RecipeShortLink.objects.filter(recipe=recipe).exists()
+        )
+
+    def test_csv(self):
+        content = (
+            'name,text,cooking_time,tags,ingredients,image\n'
+            f'Суп,Варить,30,{self.tags[0].pk},'
+            f'{self.ingredients[0].pk}:100;{self.ingredients[1].pk}:5,'
+            f'"{image_base64()}"\n'
+            'Без времени,Текст,,1,1:1,x.png\n'
+        )
+
+        response = self.upload(content, 'recipes.csv')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(response.data['created']), 1)
+        self.assertEqual(response.data['errors'][0]['row'], 3)
+        recipe = Recipe.objects.get(pk=response.data['created'][0])
+        self.assertEqual(recipe.recipe_ingredients.count(), 2)
+
+    def test_non_utf8_file(self):
+        response = self.upload(self.row().encode('cp1251'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.data)
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_failed_batch_removes_saved_images(self):
+        images = os.path.join(MEDIA_ROOT, 'recipes', 'foto')
+        before = set(os.listdir(images)) if os.path.isdir(images) else set()
+
+        with mock.patch.object(
+            RecipeShortLink.objects, 'bulk_create',
+            side_effect=IntegrityError('short code'),
+        ):
+            response = self.upload('\n'.join((self.row(), self.row())))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data['errors']), 2)
+        self.assertFalse(Recipe.objects.exists())
+        after = set(os.listdir(images)) if os.path.isdir(images) else set()
+        self.assertEqual(after, before)
+
+    def test_only_admin_can_import(self):
+        response = self.client_for(self.reader).post(URL, {})
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from api.tests.base import FoodgramTestCase
+from recipe.models import Recipe
+
+
+class RecipeCursorPaginationTest(FoodgramTestCase):
+    """Курсорная пагинация рецептов по ключу (pub_date, id)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        same_time = timezone.now()
+        cls.recipes = [
+            cls.make_recipe(cls.author, f'Рецепт {num}')
+            for num in range(7)
+        ]
+        # Часть рецептов с одинаковой датой: порядок задаёт id.
+        for num, recipe in enumerate(cls.recipes):
+            Recipe.objects.filter(pk=recipe.pk).update(
+                pub_date=same_time - timedelta(minutes=min(num, 3))
+            )
+        cls.expected = list(Recipe.objects.order_by(
+            '-pub_date', '-id'
+        ).values_list('pk', flat=True))
+
+    def get_page(self, url):
+        response = self.client_for().get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data, [
+            recipe['id'] for recipe in response.data['results']
+        ]
+
+    def test_round_trip(self):
+        data, first = self.get_page(
+            '/api/recipes/?pagination=cursor&limit=3&fields=id'
+        )
+        self.assertIsNone(data['previous'])
+        pages = [first]
+        while data['next']:
+            data, ids = self.get_page(data['next'])
+            pages.append(ids)
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        for page in reversed(pages[:-1]):
+            data, ids = self.get_page(data['previous'])
+            self.assertEqual(ids, page)
+        self.assertIsNone(data['previous'])
+
+    def test_invalid_cursor(self):
+        response = self.client_for().get(
+            '/api/recipes/?pagination=cursor&cursor=garbage'
+        )
+
+        self.assertEqual(response.status_code, 404)
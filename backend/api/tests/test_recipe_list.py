@@ -0,0 +1,78 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.tests.base import FoodgramTestCase
+
+
+class RecipeListTest(FoodgramTestCase):
+    """Список рецептов: флаги пользователя, число запросов и поля."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.recipes = []
+        for num in range(6):
+            recipe = cls.make_recipe(cls.author, f'Рецепт {num}')
+            recipe.tags.set(cls.tags[:2])
+            for ingredient in cls.ingredients[:3]:
+                recipe.recipe_ingredients.create(
+                    ingredient=ingredient, amount=num + 1
+                )
+            cls.recipes.append(recipe)
+        cls.reader.favourites.add(cls.recipes[0])
+        cls.reader.cart.recipes.add(cls.recipes[1])
+
+    def count_queries(self, url, user=None):
+        for cache in caches.all():
+            cache.clear()
+        client = self.client_for(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_queries_do_not_grow_with_page(self):
+        for url in ('/api/recipes/?limit={}',
+                    '/api/recipes/?limit={}&omit=text'):
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.count_queries(url.format(2), self.reader),
+                    self.count_queries(url.format(6), self.reader),
+                )
+
+    def test_user_flags(self):
+        response = self.client_for(self.reader).get('/api/recipes/?limit=6')
+
+        flags = {
+            recipe['id']: (
+                recipe['is_favorited'], recipe['is_in_shopping_cart']
+            ) for recipe in response.data['results']
+        }
+        self.assertEqual(flags.pop(self.recipes[0].pk), (True, False))
+        self.assertEqual(flags.pop(self.recipes[1].pk), (False, True))
+        self.assertEqual(set(flags.values()), {(False, False)})
+
+    def test_flags_are_not_shared_through_cache(self):
+        self.client_for(self.reader).get('/api/recipes/?limit=6')
+
+        response = self.client_for(self.author).get('/api/recipes/?limit=6')
+
+        self.assertFalse(any(
+            recipe['is_favorited'] or recipe['is_in_shopping_cart']
+            for recipe in response.data['results']
+        ))
+
+    def test_sparse_fields(self):
+        client = self.client_for(self.reader)
+
+        response = client.get('/api/recipes/?fields=id,name')
+        self.assertEqual(
+            set(response.data['results'][0]), {'id', 'name'}
+        )
+        response = client.get('/api/recipes/?omit=ingredients,text')
+        self.assertTrue(response.data['results'])
+        for recipe in response.data['results']:
+            self.assertNotIn('ingredients', recipe)
+            self.assertNotIn('text', recipe)
+            self.assertIn('tags', recipe)
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.tests.base import FoodgramTestCase
+from recipe.models import Recipe
+
+
+class RecipeUpdateTest(FoodgramTestCase):
+    """Обновление рецепта через API."""
+
+    def setUp(self):
+        super().setUp()
+        self.recipe = self.create_recipe()
+        self.url = f'/api/recipes/{self.recipe.pk}/'
+
+    def patch(self, **kwargs):
+        data = self.recipe_data(**kwargs)
+        del data['image']
+        return self.client_for(self.author).patch(
+            self.url, data, format='json'
+        )
+
+    def test_patch_bumps_version_once(self):
+        version = self.recipe.version
+
+        response = self.patch(
+            tags=self.tags[1:],
+            ingredients=zip(self.ingredients[:4], (11, 20, 30, 40)),
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            Recipe.objects.get(pk=self.recipe.pk).version, version + 1
+        )
+
+    def test_response_is_cached_under_current_version(self):
+        response = self.patch(
+            ingredients=zip(self.ingredients[:3], (15, 20, 30)),
+        )
+
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        fragment = cache.get(
+            f'recipe:{recipe.pk}:{recipe.version}:http://testserver'
+        )
+        self.assertIsNotNone(fragment)
+        self.assertEqual(fragment['ingredients'], response.data['ingredients'])
+        self.assertEqual(fragment['ingredients'][0]['amount'], 15)
+
+    def test_removed_ingredients_do_not_bump_version_per_row(self):
+        version = self.recipe.version
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch(
+                ingredients=[(self.ingredients[3], 5)],
+            )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertEqual(recipe.version, version + 1)
+        self.assertEqual(
+            list(recipe.recipe_ingredients.values_list(
+                'ingredient_id', 'amount'
+            )),
+            [(self.ingredients[3].pk, 5)],
+        )
+        version_updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "recipe_recipe"')
+        ]
+        self.assertEqual(len(version_updates), 1)
+
+    def test_failed_save_rolls_back_tags_and_ingredients(self):
+        version = self.recipe.version
+
+        with mock.patch.object(
+            Recipe, 'save', side_effect=OSError('storage')
+        ), self.assertRaises(OSError):
+            self.patch(
+                tags=self.tags[2:],
+                ingredients=[(self.ingredients[3], 5)],
+            )
+
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertEqual(recipe.version, version)
+        self.assertEqual(set(recipe.tags.all()), set(self.tags[:2]))
+        self.assertEqual(
+            set(recipe.recipe_ingredients.values_list(
+                'ingredient_id', 'amount'
+            )),
+            {(ingredient.pk, amount) for ingredient, amount in zip(
+                self.ingredients[:3], (10, 20, 30)
+            )},
+        )
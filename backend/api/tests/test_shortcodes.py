@@ -0,0 +1,140 @@
+from django.test import SimpleTestCase
+
+from api.constants import MAX_LENGTH_SHORT_CODE, MIN_LENGTH_SHORT_CODE
+from api.models import RecipeShortLink
+from api.shortcodes import BASE, decode_short_code, encode_short_code
+from api.tests.base import FoodgramTestCase
+
+
+def first_number(length):
+    """Первое число, код которого имеет длину length."""
+    return 1 + sum(
+        BASE ** shorter for shorter in range(MIN_LENGTH_SHORT_CODE, length)
+    )
+
+
+class ShortCodeTest(SimpleTestCase):
+    """Коды коротких ссылок по id рецепта."""
+
+    def test_round_trip_at_length_boundaries(self):
+        for length in range(MIN_LENGTH_SHORT_CODE, MAX_LENGTH_SHORT_CODE):
+            first = first_number(length)
+            for number, expected_length in (
+                (first, length),
+                (first + 1, length),
+                (first_number(length + 1) - 1, length),
+                (first_number(length + 1), length + 1),
+            ):
+                with self.subTest(number=number):
+                    code = encode_short_code(number)
+                    self.assertEqual(len(code), expected_length)
+                    self.assertEqual(decode_short_code(code), number)
+
+    def test_neighbours_differ(self):
+        codes = [encode_short_code(number) for number in range(1, 1001)]
+
+        self.assertEqual(len(set(codes)), len(codes))
+        self.assertTrue(all(
+            len(code) == MIN_LENGTH_SHORT_CODE for code in codes
+        ))
+        self.assertNotEqual(codes[0][:-1], codes[1][:-1])
+
+    def test_decode_rejects_foreign_codes(self):
+        for code in ('abc', 'ab-d', '', 'a' * (MAX_LENGTH_SHORT_CODE + 1)):
+            with self.subTest(code=code):
+                self.assertIsNone(decode_short_code(code))
+
+    def test_decode_is_canonical(self):
+        for number in (1, 2, first_number(5), first_number(6) - 1):
+            code = encode_short_code(number)
+            with self.subTest(code=code):
+                self.assertEqual(
+                    encode_short_code(decode_short_code(code)), code
+                )
+
+    def test_encode_rejects_non_positive(self):
+        with self.assertRaises(ValueError):
+            encode_short_code(0)
+
+
+class RedirectTest(FoodgramTestCase):
+    """Переход по короткой ссылке."""
+
+    def setUp(self):
+        super().setUp()
+        self.recipe = self.make_recipe(self.author)
+        self.path = f'/recipes/{self.recipe.pk}/'
+
+    def test_generated_code_is_cached(self):
+        code = RecipeShortLink.objects.create(recipe=self.recipe).short_code
+
+        with self.assertNumQueries(1):
+            self.client.get(f'/s/{code}')
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/s/{code}')
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].endswith(self.path))
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_unknown_generated_code(self):
+        response = self.client.get('/s/zzzz')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_deleted_recipe_code(self):
+        code = RecipeShortLink.objects.create(recipe=self.recipe).short_code
+        self.client.get(f'/s/{code}')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.delete()
+
+        self.assertEqual(self.client.get(f'/s/{code}').status_code, 404)
+
+    def test_foreign_strings_without_queries(self):
+        for code in ('ab', 'a-b', 'a' * (MAX_LENGTH_SHORT_CODE + 1)):
+            with self.subTest(code=code), self.assertNumQueries(0):
+                response = self.client.get(f'/s/{code}')
+                self.assertEqual(response.status_code, 404)
+
+    def test_legacy_code_is_cached(self):
+        RecipeShortLink.objects.create(recipe=self.recipe, short_code='aB3')
+
+        with self.assertNumQueries(1):
+            self.client.get('/s/aB3')
+        with self.assertNumQueries(0):
+            response = self.client.get('/s/aB3')
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].endswith(self.path))
+
+    def test_unknown_legacy_code(self):
+        response = self.client.get('/s/zzz')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_deleted_link_leaves_cache_after_commit(self):
+        RecipeShortLink.objects.create(recipe=self.recipe, short_code='aB3')
+        self.client.get('/s/aB3')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.recipe.delete()
+        self.assertEqual(self.client.get('/s/aB3').status_code, 302)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(self.client.get('/s/aB3').status_code, 404)
+
+    def test_edited_link_follows_stored_recipe(self):
+        link = RecipeShortLink.objects.create(recipe=self.recipe)
+        self.client.get(f'/s/{link.short_code}')
+        other = self.make_recipe(self.author, 'Другой')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            link.recipe = other
+            link.save()
+
+        response = self.client.get(f'/s/{link.short_code}')
+        self.assertTrue(
+            response['Location'].endswith(f'/recipes/{other.pk}/')
+        )
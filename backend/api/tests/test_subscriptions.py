@@ -0,0 +1,55 @@
+from api.tests.base import FoodgramTestCase
+
+
+class SubscriptionsTest(FoodgramTestCase):
+    """Список подписок с ограничением числа рецептов."""
+
+    def setUp(self):
+        super().setUp()
+        self.authors = [self.author, self.create_user('second')]
+        self.recipes = {
+            author.pk: [
+                self.make_recipe(author, f'{author.username} {num}')
+                for num in range(count)
+            ]
+            for author, count in zip(self.authors, (5, 2))
+        }
+        self.reader.subscriptions.add(*self.authors)
+        self.client = self.client_for(self.reader)
+
+    def get(self, **params):
+        response = self.client.get('/api/users/subscriptions/', params)
+        self.assertEqual(response.status_code, 200)
+        return {item['id']: item for item in response.data['results']}
+
+    def test_recipes_limit(self):
+        with self.assertNumQueries(4):
+            results = self.get(recipes_limit=3)
+
+        for author in self.authors:
+            recipes = self.recipes[author.pk]
+            item = results[author.pk]
+            self.assertEqual(item['recipes_count'], len(recipes))
+            self.assertEqual(
+                [recipe['id'] for recipe in item['recipes']],
+                [recipe.pk for recipe in reversed(recipes)][:3],
+            )
+            self.assertEqual(
+                set(item['recipes'][0]),
+                {'id', 'name', 'image', 'image_variants', 'cooking_time'},
+            )
+
+    def test_without_limit(self):
+        results = self.get()
+
+        self.assertEqual(len(results[self.author.pk]['recipes']), 5)
+
+    def test_queries_do_not_grow_with_authors(self):
+        self.get(recipes_limit=1)
+        for num in range(3):
+            author = self.create_user(f'extra{num}')
+            self.make_recipe(author)
+            self.reader.subscriptions.add(author)
+
+        with self.assertNumQueries(4):
+            self.get(recipes_limit=1)
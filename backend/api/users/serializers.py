@@ -1,29 +1,35 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import FileExtensionValidator, RegexValidator
+from django.db.models import OuterRef, Prefetch, Subquery
 from rest_framework import serializers
 
 from api import constants as c
-from api.fields import Base64ImageField
-from api.users.utils import already_use
+from api.fields import Base64ImageField, ImageVariantsField
+from api.mixins import SparseFieldsSerializerMixin
+from api.users.utils import already_use, get_subscription_ids
 from api.validators import PhotoValidator
+from recipe.models import Recipe
 from users.constants import LEN_USERNAME
 from users.validators import NotMeValidator
 
 User = get_user_model()
 
 
-class BaseUserSerializer(serializers.ModelSerializer):
+class BaseUserSerializer(SparseFieldsSerializerMixin,
+                         serializers.ModelSerializer):
     """Базовый сериализатор пользователей."""
 
     is_subscribed = serializers.SerializerMethodField()
 
+    planner_hints = {'is_subscribed': ()}
+
     def get_is_subscribed(self, obj):
         """Метод получения атрибута подписки."""
 
         request = self.context.get('request')
         current_user = request.user
         if not current_user.is_anonymous and current_user != obj:
-            return obj in current_user.subscriptions.all()
+            return obj.id in get_subscription_ids(request)
         return False
 
 
@@ -40,6 +46,7 @@ class UserSerializer(BaseUserSerializer):
                     ]
     )
     password = serializers.CharField(write_only=True)
+    avatar_variants = ImageVariantsField(source='image_variants')
 
     class Meta:
         model = User
@@ -50,6 +57,7 @@ class UserSerializer(BaseUserSerializer):
             'last_name',
             'is_subscribed',
             'avatar',
+            'avatar_variants',
             'password',
             'email',)
         read_only_fields = ('id',)
@@ -62,6 +70,7 @@ class UserSerializer(BaseUserSerializer):
         if self.context.get('is_registration'):
             data.pop('is_subscribed', None)
             data.pop('avatar', None)
+            data.pop('avatar_variants', None)
         return data
 
 
@@ -98,6 +107,13 @@ class ExtendUserSerializer(BaseUserSerializer):
 
     recipes_count = serializers.SerializerMethodField()
     recipes = serializers.SerializerMethodField()
+    avatar_variants = ImageVariantsField(source='image_variants')
+
+    planner_hints = {
+        **BaseUserSerializer.planner_hints,
+        'recipes_count': (),
+        'recipes': (),
+    }
 
     class Meta:
         model = User
@@ -108,11 +124,34 @@ class ExtendUserSerializer(BaseUserSerializer):
                   'email',
                   'is_subscribed',
                   'avatar',
+                  'avatar_variants',
                   'recipes_count',
                   'recipes')
         read_only_fields = ('__all__',)
 
+    @staticmethod
+    def recipes_prefetch(recipes_limit=None):
+        """Подгрузка рецептов авторов, не более recipes_limit на автора.
+
+        Ограничение применяется в базе подзапросом по автору, у рецептов
+        выбираются только поля краткого представления.
+        """
+        from api.recipe.serializers import RecipeStripSerializer
+        recipes = Recipe.objects.only(
+            'author', *RecipeStripSerializer.Meta.fields
+        )
+        if recipes_limit:
+            recipes = recipes.filter(pk__in=Subquery(
+                Recipe.objects.filter(
+                    author=OuterRef('author')
+                ).values('pk')[:int(recipes_limit)]
+            ))
+        return Prefetch('recipes', queryset=recipes)
+
     def get_recipes_count(self, obj):
+        recipes_count = getattr(obj, 'recipes_count', None)
+        if recipes_count is not None:
+            return recipes_count
         return obj.recipes.count()
 
     def get_recipes(self, obj):
@@ -10,3 +10,22 @@ def already_use(data):
     if already_use:
         raise ValidationError(already_use)
     return data
+
+
+def get_subscription_ids(request):
+    """Множество id авторов, на которых подписан текущий пользователь.
+
+    Загружается одним запросом и кешируется на объекте запроса, поэтому
+    все вложенные сериализаторы пользователей в ответе используют его
+    совместно.
+    """
+    user = request.user
+    if user.is_anonymous:
+        return frozenset()
+    subscription_ids = getattr(request, '_subscription_ids', None)
+    if subscription_ids is None:
+        subscription_ids = set(
+            user.subscriptions.values_list('id', flat=True)
+        )
+        request._subscription_ids = subscription_ids
+    return subscription_ids
@@ -1,13 +1,17 @@
 from django.contrib.auth import get_user_model
+from django.db.models import Count
 from djoser.serializers import SetPasswordSerializer
 from rest_framework import filters, status
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from api.mixins import SparseFieldsMixin
 from api.paginators import LimitSizePagination
 from api.permissions import IsProfileOwner
+from api.planner import get_plan
 from api.users.serializers import (AvatarSerializer, ExtendUserSerializer,
                                    UserSerializer)
 from api.utils import SubscriptionResponseGenerator
@@ -15,7 +19,7 @@ from api.utils import SubscriptionResponseGenerator
 Users = get_user_model()
 
 
-class UsersViewSet(ModelViewSet):
+class UsersViewSet(SparseFieldsMixin, ModelViewSet):
     """Вьюсет для презентации и регистрации пользователей.
     Показывает список пользователей. [AllowAny]
     Показывает пользователя по id. [AllowAny]
@@ -32,8 +36,16 @@ class UsersViewSet(ModelViewSet):
     http_method_name = ['get', 'post']
     pagination_class = LimitSizePagination
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            return get_plan(
+                self.get_serializer_class(), self.get_sparse_fields()
+            ).apply(queryset)
+        return queryset
+
     def get_serializer(self, *args, **kwargs):
-        kwargs['context'] = {'request': self.request}
+        kwargs['context'] = self.get_serializer_context()
         return super().get_serializer(*args, **kwargs)
 
     def perform_create(self, serializer: UserSerializer):
@@ -56,6 +68,7 @@ class UsersViewSet(ModelViewSet):
         permission_classes=[
             IsAuthenticated,
             IsProfileOwner],
+        parser_classes=[JSONParser, FormParser, MultiPartParser],
         url_path='me/avatar'
     )
     def get_avatar(self, request):
@@ -96,7 +109,13 @@ class UsersViewSet(ModelViewSet):
     def subscriptions(self, request):
         """Вывод водписок."""
         recipes_limit = request.query_params.get('recipes_limit', None)
-        queryset = request.user.subscriptions.all()
+        queryset = get_plan(ExtendUserSerializer).apply(
+            request.user.subscriptions.annotate(
+                recipes_count=Count('recipes')
+            )
+        ).prefetch_related(
+            ExtendUserSerializer.recipes_prefetch(recipes_limit)
+        )
         page = self.paginate_queryset(queryset)
         serializer = ExtendUserSerializer(
             page,
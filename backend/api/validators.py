@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.utils.deconstruct import deconstructible
 from rest_framework import status
 from rest_framework.request import Request
@@ -104,10 +104,13 @@ class RecipeDataValidator:
                     'Для каждого ингрединта должен быть указан '
                     'id и его количество в рецепте'
                 )
-            if not Ingredient.objects.filter(id=ingredient_id).exists():
-                raise ValidationError('Ингредиент не существует')
             ingredients_id.append(ingredient_id)
-        if len(set(ingredients_id)) != len(self.ingredients):
+        unique_id = set(ingredients_id)
+        if Ingredient.objects.filter(id__in=unique_id).count() != len(
+            unique_id
+        ):
+            raise ValidationError('Ингредиент не существует')
+        if len(unique_id) != len(self.ingredients):
             raise ValidationError(
                 {'ingredients': 'Нельзя добавлять одинаковые ингредиенты'}
             )
@@ -137,9 +140,9 @@ class RecipeDataValidator:
             raise ValidationError(
                 {'image': 'Отсутствует фото рецепта.'}
             )
-        if not isinstance(self.image, ContentFile):
+        if not isinstance(self.image, File):
             raise ValidationError(
-                {'image': 'Тип данных не соответвует ожидаемому "ContentFile"'}
+                {'image': 'Тип данных не соответвует ожидаемому "File"'}
             )
 
     def _text_validator(self):
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from cart.models import CartIngredient
+
+
+class Command(BaseCommand):
+    help = ('Сверяет итоги ингредиентов корзин с составом корзин и '
+            'пересобирает таблицу итогов с нуля.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать число корзин с расхождениями',
+        )
+
+    def handle(self, *args, **kwargs):
+        stored = set(
+            CartIngredient.objects.values_list(
+                'cart_id', 'ingredient_id', 'total_amount'
+            ).iterator()
+        )
+        actual = {
+            (row['cart_id'], row['ingredient_id'], row['total_amount'])
+            for row in CartIngredient.objects.compute().iterator()
+        }
+        mismatched = {row[0] for row in stored ^ actual}
+        self.stdout.write(f'Корзин с расхождениями: {len(mismatched)}')
+        if kwargs['dry_run']:
+            return
+
+        CartIngredient.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS('Итоги корзин пересобраны'))
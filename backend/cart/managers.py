@@ -0,0 +1,94 @@
+from django.db import models, transaction
+from django.db.models import F, Sum
+
+from ingredient.models import RecipeIngredient
+
+
+class CartIngredientManager(models.Manager):
+    """Менеджер итоговых количеств ингредиентов в корзинах."""
+
+    @property
+    def _cart_recipes(self):
+        return self.model._meta.get_field('cart').related_model.recipes.through
+
+    def compute(self, cart_ids=None):
+        """Итоги ингредиентов, посчитанные по рецептам корзин."""
+        cart_recipes = self._cart_recipes.objects.all()
+        if cart_ids is not None:
+            cart_recipes = cart_recipes.filter(cart_id__in=cart_ids)
+        return (
+            cart_recipes.
+            filter(recipe__recipe_ingredients__isnull=False).
+            values(
+                'cart_id',
+                ingredient_id=F('recipe__recipe_ingredients__ingredient'),
+            ).
+            annotate(
+                total_amount=Sum('recipe__recipe_ingredients__amount')
+            ).
+            order_by()
+        )
+
+    @transaction.atomic
+    def rebuild(self, cart_ids=None):
+        """Пересчёт итогов корзин с нуля (всех, если корзины не указаны)."""
+        rows = self.all()
+        if cart_ids is not None:
+            cart_ids = list(cart_ids)
+            rows = rows.filter(cart_id__in=cart_ids)
+        rows.delete()
+        self.bulk_create(
+            (self.model(**values) for values in self.compute(cart_ids)),
+            batch_size=1000,
+        )
+
+    def rebuild_for_recipe(self, recipe):
+        """Пересчёт итогов всех корзин, в которых есть рецепт."""
+        self.rebuild(
+            self._cart_recipes.objects.
+            filter(recipe=recipe).values_list('cart_id', flat=True)
+        )
+
+    @transaction.atomic
+    def apply_recipes(self, cart_id, recipe_ids, sign=1):
+        """Добавление (sign=1) или вычитание (sign=-1) ингредиентов
+        рецептов из итогов корзины.
+        """
+        delta = dict(
+            RecipeIngredient.objects.
+            filter(recipe_id__in=recipe_ids).
+            values('ingredient_id').
+            annotate(total=Sum('amount')).
+            values_list('ingredient_id', 'total').
+            order_by()
+        )
+        if not delta:
+            return
+        rows = {
+            row.ingredient_id: row
+            for row in self.select_for_update().filter(
+                cart_id=cart_id, ingredient_id__in=delta
+            )
+        }
+        created, changed, empty = [], [], []
+        for ingredient_id, amount in delta.items():
+            row = rows.get(ingredient_id)
+            if row is None:
+                if sign > 0:
+                    created.append(self.model(
+                        cart_id=cart_id,
+                        ingredient_id=ingredient_id,
+                        total_amount=amount,
+                    ))
+                continue
+            row.total_amount += sign * amount
+            if row.total_amount > 0:
+                changed.append(row)
+            else:
+                empty.append(row.pk)
+        if created:
+            self.bulk_create(created)
+        if changed:
+            self.bulk_update(changed, ('total_amount',))
+        if empty:
+            self.filter(pk__in=empty).delete()
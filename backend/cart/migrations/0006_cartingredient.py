@@ -0,0 +1,54 @@
+# Generated by Django 3.2 on 2026-10-18 16:55
+
+from django.db import migrations, models
+from django.db.models import F, Sum
+import django.db.models.deletion
+
+
+def fill_totals(apps, schema_editor):
+    Cart = apps.get_model('cart', 'Cart')
+    CartIngredient = apps.get_model('cart', 'CartIngredient')
+    totals = (
+        Cart.recipes.through.objects.
+        filter(recipe__recipe_ingredients__isnull=False).
+        values(
+            'cart_id',
+            ingredient_id=F('recipe__recipe_ingredients__ingredient'),
+        ).
+        annotate(total_amount=Sum('recipe__recipe_ingredients__amount')).
+        order_by()
+    )
+    CartIngredient.objects.bulk_create(
+        (CartIngredient(**values) for values in totals), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredient', '0007_ingredient_updated_at'),
+        ('cart', '0005_alter_cart_options'),
+        ('recipe', '0014_recipeevent_trendingscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CartIngredient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_amount', models.PositiveIntegerField(verbose_name='Общее количество')),
+                ('cart', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ingredient_totals', to='cart.cart', verbose_name='Корзина')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ingredient_totals', to='ingredient.ingredient', verbose_name='Ингредиент')),
+            ],
+            options={
+                'verbose_name': 'Ингредиент корзины',
+                'verbose_name_plural': 'Ингредиенты корзины',
+                'default_related_name': 'ingredient_totals',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cartingredient',
+            constraint=models.UniqueConstraint(fields=('cart', 'ingredient'), name='unique_cart_ingredient'),
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.db import models
 
+from cart.managers import CartIngredientManager
+
 
 class Cart(models.Model):
     """Модель покупательской корзины."""
@@ -25,3 +27,41 @@ class Cart(models.Model):
     class Meta:
         verbose_name = 'Корзина'
         verbose_name_plural = 'Корзины'
+
+
+class CartIngredient(models.Model):
+    """Итоговое количество ингредиента в корзине.
+
+    Поддерживается при изменении состава корзины и ингредиентов рецептов,
+    чтобы список покупок читался без агрегации по рецептам.
+    """
+
+    cart = models.ForeignKey(
+        Cart,
+        on_delete=models.CASCADE,
+        verbose_name='Корзина'
+    )
+    ingredient = models.ForeignKey(
+        'ingredient.Ingredient',
+        on_delete=models.CASCADE,
+        verbose_name='Ингредиент'
+    )
+    total_amount = models.PositiveIntegerField(
+        verbose_name='Общее количество'
+    )
+
+    objects = CartIngredientManager()
+
+    class Meta:
+        verbose_name = 'Ингредиент корзины'
+        verbose_name_plural = 'Ингредиенты корзины'
+        default_related_name = 'ingredient_totals'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['cart', 'ingredient'],
+                name='unique_cart_ingredient',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.ingredient} — {self.total_amount}'
@@ -0,0 +1,35 @@
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+
+from cart.models import Cart, CartIngredient
+from recipe.models import Recipe
+
+
+@receiver(m2m_changed, sender=Cart.recipes.through)
+def cart_recipes_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    """Поддержка итогов ингредиентов при изменении состава корзины."""
+    if action in ('post_add', 'post_remove'):
+        sign = 1 if action == 'post_add' else -1
+        if reverse:
+            for cart_id in pk_set:
+                CartIngredient.objects.apply_recipes(
+                    cart_id, {instance.pk}, sign
+                )
+        else:
+            CartIngredient.objects.apply_recipes(instance.pk, pk_set, sign)
+    elif action == 'pre_clear':
+        if reverse:
+            recipe_deleted(Recipe, instance)
+        else:
+            CartIngredient.objects.filter(cart=instance).delete()
+
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_deleted(sender, instance, **kwargs):
+    """Вычитание ингредиентов удаляемого рецепта из корзин."""
+    cart_ids = Cart.objects.filter(
+        recipes=instance
+    ).values_list('pk', flat=True)
+    for cart_id in cart_ids:
+        CartIngredient.objects.apply_recipes(cart_id, {instance.pk}, -1)
@@ -0,0 +1,124 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from cart.models import CartIngredient
+from ingredient.models import Ingredient
+from recipe.models import Recipe
+
+User = get_user_model()
+
+
+class CartTotalsTest(TestCase):
+    """Итоги ингредиентов корзины при изменении её состава."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.owner, cls.other = (
+            User.objects.create_user(
+                username=name, email=f'{name}@example.com',
+                password='password', first_name=name, last_name=name,
+            ) for name in ('author', 'owner', 'other')
+        )
+        cls.flour, cls.milk, cls.eggs = (
+            Ingredient.objects.create(name=name, measurement_unit='г')
+            for name in ('Мука', 'Молоко', 'Яйца')
+        )
+        cls.pancakes = cls.make_recipe(
+            'Блины', {cls.flour: 200, cls.milk: 500, cls.eggs: 2}
+        )
+        cls.bread = cls.make_recipe('Хлеб', {cls.flour: 500})
+
+    @classmethod
+    def make_recipe(cls, name, amounts):
+        recipe = Recipe(
+            name=name, author=cls.author, text='Текст', cooking_time=10,
+            image='recipes/foto/recipe.png',
+        )
+        recipe.save()
+        for ingredient, amount in amounts.items():
+            recipe.recipe_ingredients.create(
+                ingredient=ingredient, amount=amount
+            )
+        return recipe
+
+    def totals(self, user=None):
+        cart = (user or self.owner).cart
+        return dict(
+            CartIngredient.objects.filter(cart=cart).
+            values_list('ingredient__name', 'total_amount')
+        )
+
+    def assertTotalsMatchComputed(self):
+        stored = set(CartIngredient.objects.values_list(
+            'cart_id', 'ingredient_id', 'total_amount'
+        ))
+        computed = {
+            (row['cart_id'], row['ingredient_id'], row['total_amount'])
+            for row in CartIngredient.objects.compute()
+        }
+        self.assertEqual(stored, computed)
+
+    def test_add_and_remove(self):
+        cart = self.owner.cart
+        cart.recipes.add(self.pancakes, self.bread)
+        self.assertEqual(
+            self.totals(), {'Мука': 700, 'Молоко': 500, 'Яйца': 2}
+        )
+
+        cart.recipes.remove(self.pancakes)
+        self.assertEqual(self.totals(), {'Мука': 500})
+        self.assertTotalsMatchComputed()
+
+    def test_add_from_recipe_side(self):
+        self.bread.cart_set.add(self.owner.cart, self.other.cart)
+
+        self.assertEqual(self.totals(), {'Мука': 500})
+        self.assertEqual(self.totals(self.other), {'Мука': 500})
+        self.bread.cart_set.remove(self.other.cart)
+        self.assertEqual(self.totals(self.other), {})
+
+    def test_clear(self):
+        self.owner.cart.recipes.add(self.pancakes)
+        self.other.cart.recipes.add(self.pancakes, self.bread)
+
+        self.owner.cart.recipes.clear()
+        self.pancakes.cart_set.clear()
+
+        self.assertEqual(self.totals(), {})
+        self.assertEqual(self.totals(self.other), {'Мука': 500})
+
+    def test_recipe_deleted(self):
+        self.owner.cart.recipes.add(self.pancakes, self.bread)
+
+        self.bread.delete()
+
+        self.assertEqual(
+            self.totals(), {'Мука': 200, 'Молоко': 500, 'Яйца': 2}
+        )
+
+    def test_rebuild_for_recipe(self):
+        self.owner.cart.recipes.add(self.pancakes)
+        self.pancakes.recipe_ingredients.filter(
+            ingredient=self.flour
+        ).update(amount=300)
+
+        CartIngredient.objects.rebuild_for_recipe(self.pancakes)
+
+        self.assertEqual(self.totals()['Мука'], 300)
+        self.assertTotalsMatchComputed()
+
+    def test_rebuild_command_repairs_drift(self):
+        self.owner.cart.recipes.add(self.pancakes, self.bread)
+        CartIngredient.objects.filter(ingredient=self.flour).update(
+            total_amount=1
+        )
+        CartIngredient.objects.filter(ingredient=self.eggs).delete()
+
+        call_command('rebuild_cart_totals', stdout=StringIO())
+
+        self.assertEqual(
+            self.totals(), {'Мука': 700, 'Молоко': 500, 'Яйца': 2}
+        )
@@ -0,0 +1,100 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Счётчик SQL-запросов и их суммарного времени."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class QueryBudgetMiddleware:
+    """Учёт SQL-запросов на каждый запрос к серверу.
+
+    Считает число запросов к базе, их суммарное время и время работы
+    представления. При включённом SERVER_TIMING отдаёт метрики в
+    заголовке Server-Timing. Если маршрут превысил бюджет запросов из
+    SQL_QUERY_BUDGETS, пишет предупреждение в лог. Бюджет ищется по ключу
+    'METHOD view-name', затем по имени маршрута 'view-name'.
+
+    У потоковых ответов запросы считаются до закрытия ответа, включая
+    выполненные при чтении содержимого, и бюджет проверяется после
+    отправки тела. Заголовок Server-Timing уходит раньше тела, поэтому
+    для них содержит только работу представления.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = settings.SERVER_TIMING
+        self.budgets = settings.SQL_QUERY_BUDGETS
+        self.default_budget = settings.SQL_QUERY_BUDGET_DEFAULT
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'db;dur={stats.duration * 1000:.1f};'
+                f'desc="{stats.count} queries", '
+                f'view;dur={(total - stats.duration) * 1000:.1f}, '
+                f'total;dur={total * 1000:.1f}'
+            )
+        if response.streaming:
+            response.streaming_content = self._counted(
+                response.streaming_content, request, stats, started
+            )
+        else:
+            self._check_budget(request, stats, total)
+        return response
+
+    def _counted(self, content, request, stats, started):
+        """Содержимое потокового ответа с учётом запросов при чтении.
+
+        Бюджет проверяется, когда ответ прочитан или закрыт.
+        """
+        try:
+            with connection.execute_wrapper(stats):
+                yield from content
+        finally:
+            self._check_budget(
+                request, stats, time.perf_counter() - started
+            )
+
+    def _check_budget(self, request, stats, total):
+        route = self._get_route(request)
+        budget = self.budgets.get(
+            f'{request.method} {route}',
+            self.budgets.get(route, self.default_budget)
+        )
+        if budget is not None and stats.count > budget:
+            logger.warning(
+                'SQL budget exceeded: %s %s (%s) ran %d queries, '
+                'budget %d, sql %.1f ms, total %.1f ms',
+                request.method, request.path, route, stats.count, budget,
+                stats.duration * 1000, total * 1000,
+            )
+
+    def _get_route(self, request):
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is None:
+            return None
+        return resolver_match.view_name
@@ -33,6 +33,7 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
+    'foodgram.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -111,6 +112,74 @@ REST_FRAMEWORK = {
     ],
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': config(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': config('CACHE_LOCATION', default='foodgram'),
+    },
+    'exports': {
+        'BACKEND': config(
+            'EXPORT_CACHE_BACKEND',
+            default='api.cache.SizeLimitedLocMemCache'
+        ),
+        'LOCATION': config(
+            'EXPORT_CACHE_LOCATION', default='foodgram-exports'
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': config(
+                'EXPORT_CACHE_MAX_ENTRIES', default=200, cast=int
+            ),
+            'MAX_SIZE': config(
+                'EXPORT_CACHE_MAX_SIZE', default=64 * 1024 * 1024, cast=int
+            ),
+        },
+    },
+}
+
+SHORT_LINK_CACHE = config('SHORT_LINK_CACHE', default='default')
+
+SERVER_TIMING = config('SERVER_TIMING', default=DEBUG, cast=bool)
+
+SQL_QUERY_BUDGET_DEFAULT = config(
+    'SQL_QUERY_BUDGET_DEFAULT', default=0, cast=int
+) or None
+
+SQL_QUERY_BUDGETS = {
+    'GET recipes-list': 10,
+    'GET recipes-detail': 8,
+    'GET recipes-trending': 10,
+    'GET tag-list': 2,
+    'GET ingredients-list': 2,
+    'GET users-list': 6,
+    'GET users-subscriptions': 8,
+    'GET redirect': 1,
+}
+
+BACKGROUND_WORKERS = config('BACKGROUND_WORKERS', default=2, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'foodgram': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'api': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CORS_ALLOW_ALL_ORIGINS = DEBUG
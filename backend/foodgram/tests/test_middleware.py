@@ -0,0 +1,88 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.urls import include, path
+
+User = get_user_model()
+
+
+def stream_users(request):
+    """Потоковый ответ, читающий базу при отдаче тела."""
+    return StreamingHttpResponse(
+        user.username for _ in range(3) for user in User.objects.all()
+    )
+
+
+urlpatterns = [
+    path('stream/', stream_users, name='stream-users'),
+    path('', include('foodgram.urls')),
+]
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+    """Учёт SQL-запросов и заголовок Server-Timing."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(
+            username='user', email='user@example.com', password='password',
+            first_name='user', last_name='user',
+        )
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get('/api/users/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="\d+ queries", '
+            r'view;dur=[\d.]+, total;dur=[\d.]+$'
+        )
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        response = self.client.get('/api/users/')
+
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(SQL_QUERY_BUDGETS={'GET users-list': 0})
+    def test_budget_exceeded_is_logged(self):
+        with self.assertLogs('foodgram.middleware', 'WARNING') as logs:
+            self.client.get('/api/users/')
+
+        self.assertIn('SQL budget exceeded: GET /api/users/', logs.output[0])
+        self.assertIn('(users-list)', logs.output[0])
+
+    @override_settings(
+        SQL_QUERY_BUDGETS={'users-list': 0, 'GET users-list': 100}
+    )
+    def test_method_budget_takes_precedence(self):
+        with mock.patch('foodgram.middleware.logger') as logger:
+            self.client.get('/api/users/')
+
+        logger.warning.assert_not_called()
+
+    @override_settings(
+        ROOT_URLCONF=__name__, SQL_QUERY_BUDGETS={'GET stream-users': 2}
+    )
+    def test_streaming_queries_are_counted(self):
+        with self.assertLogs('foodgram.middleware', 'WARNING') as logs:
+            response = self.client.get('/stream/')
+            self.assertEqual(b''.join(response.streaming_content), b'user' * 3)
+            response.close()
+
+        self.assertIn('ran 3 queries, budget 2', logs.output[0])
+
+    @override_settings(
+        ROOT_URLCONF=__name__, SQL_QUERY_BUDGETS={'GET stream-users': 3}
+    )
+    def test_streaming_within_budget(self):
+        with mock.patch('foodgram.middleware.logger') as logger:
+            response = self.client.get('/stream/')
+            b''.join(response.streaming_content)
+            response.close()
+
+        logger.warning.assert_not_called()
@@ -1,11 +1,31 @@
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
+from django.utils.cache import patch_cache_control
 
+from api.cache import get_short_link_path, set_short_link_path
+from api.constants import SHORT_LINK_MAX_AGE
 from api.models import RecipeShortLink
+from api.shortcodes import is_short_code
 
 
 def redirect_to_original(request, short_code):
     """
     Перенаправляет пользователя с короткой ссылки на оригинальный URL.
+
+    Код ищется в сохранённых ссылках: сначала в кеше, в базу запрос идёт
+    только при промахе. Строки, которые не могут быть выданным кодом,
+    отклоняются без запросов. Ответ разрешено кешировать браузерам и
+    прокси.
     """
-    link = get_object_or_404(RecipeShortLink, short_code=short_code)
-    return redirect(link.get_original_url(request))
+    if not is_short_code(short_code):
+        raise Http404
+    path = get_short_link_path(short_code)
+    if path is None:
+        link = get_object_or_404(
+            RecipeShortLink.objects.only('recipe_id'), short_code=short_code
+        )
+        path = link.get_original_path()
+        set_short_link_path(short_code, path)
+    response = redirect(request.build_absolute_uri(path))
+    patch_cache_control(response, public=True, max_age=SHORT_LINK_MAX_AGE)
+    return response
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 16:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredient', '0006_auto_20250302_1855'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+    ]
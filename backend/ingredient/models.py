@@ -34,6 +34,10 @@ class Ingredient(models.Model):
         choices=Units.choices,
         default=Units.GRAM
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
 
     class Meta:
         verbose_name = 'Ингредиент'
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
+from cart.models import CartIngredient
 from recipe.models import Recipe, Tag
 
 
@@ -27,7 +28,7 @@ class RecipeAdmin(admin.ModelAdmin):
     search_fields = ('name', 'author__username', 'tags__name')
     date_hierarchy = 'pub_date'
     ordering = ('-pub_date',)
-    readonly_fields = ('pub_date',)
+    readonly_fields = ('pub_date', 'updated_at')
     raw_id_fields = ('author',)
     filter_horizontal = ('tags',)
     inlines = (RecipeIngredientInline,)
@@ -41,7 +42,7 @@ class RecipeAdmin(admin.ModelAdmin):
                        'cooking_time', 'is_active')
         }),
         ('Метаданные', {
-            'fields': ('pub_date',),
+            'fields': ('pub_date', 'updated_at'),
             'classes': ('collapse',)
         }),
         ('Теги', {
@@ -63,6 +64,11 @@ class RecipeAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request).prefetch_related('tags', 'author')
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        if change:
+            CartIngredient.objects.rebuild_for_recipe(form.instance)
+
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
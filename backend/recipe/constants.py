@@ -2,3 +2,12 @@ LEN_RECIPE_NAME = 254
 LEN_TAG_NAME = 30
 MIN_COOKING_TIME = 1
 MAX_COOKING_TIME = 360
+
+AUTHOR_SERVICE_FIELDS = frozenset(('last_login', 'password'))
+DENORMALIZED_FIELDS = frozenset(
+    ('favorites_count', 'cart_count', 'image_variants')
+)
+
+LEN_EVENT_KIND = 10
+TRENDING_WINDOW_DAYS = 14
+TRENDING_HALF_LIFE_HOURS = 48
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from cart.models import Cart
+from recipe.models import Recipe
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Сверяет счётчики избранного и корзин рецептов с таблицами '
+            'связей и исправляет расхождения. Предназначена для '
+            'периодического запуска.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать число рецептов с расхождениями',
+        )
+
+    def handle(self, *args, **kwargs):
+        recipes = Recipe.objects.annotate(
+            actual_favorites=self._count(User.favourites.through),
+            actual_carts=self._count(Cart.recipes.through),
+        )
+        mismatched = recipes.filter(
+            ~Q(favorites_count=Coalesce('actual_favorites', 0))
+            | ~Q(cart_count=Coalesce('actual_carts', 0))
+        ).count()
+        self.stdout.write(f'Рецептов с расхождениями: {mismatched}')
+        if kwargs['dry_run'] or not mismatched:
+            return
+
+        Recipe.objects.update(
+            favorites_count=Coalesce(
+                self._count(User.favourites.through), 0
+            ),
+            cart_count=Coalesce(self._count(Cart.recipes.through), 0),
+        )
+        self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны'))
+
+    def _count(self, through):
+        return Subquery(
+            through.objects.filter(
+                recipe=OuterRef('pk')
+            ).values('recipe').annotate(total=Count('pk')).values('total')
+        )
@@ -0,0 +1,70 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from recipe import constants as c
+from recipe.models import RecipeEvent, TrendingScore
+
+EVENT_WEIGHTS = {
+    RecipeEvent.Kind.FAVORITE: 1.0,
+    RecipeEvent.Kind.CART: 1.5,
+}
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает таблицу популярности рецептов по событиям '
+            'избранного и корзин с экспоненциальным затуханием. '
+            'Предназначена для периодического запуска.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window-days',
+            type=int,
+            default=c.TRENDING_WINDOW_DAYS,
+            help='Учитываемый период в днях',
+        )
+        parser.add_argument(
+            '--half-life-hours',
+            type=float,
+            default=c.TRENDING_HALF_LIFE_HOURS,
+            help='Период полураспада оценки в часах',
+        )
+
+    def handle(self, *args, **kwargs):
+        now = timezone.now()
+        since = now - timedelta(days=kwargs['window_days'])
+        half_life = kwargs['half_life_hours']
+
+        buckets = (
+            RecipeEvent.objects.filter(created_at__gte=since)
+            .annotate(hour=TruncHour('created_at'))
+            .values('recipe_id', 'kind', 'hour')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        scores = defaultdict(float)
+        for bucket in buckets.iterator():
+            age = (now - bucket['hour']).total_seconds() / 3600
+            scores[bucket['recipe_id']] += (
+                EVENT_WEIGHTS[bucket['kind']] * bucket['total']
+                * 0.5 ** (age / half_life)
+            )
+
+        with transaction.atomic():
+            TrendingScore.objects.all().delete()
+            TrendingScore.objects.bulk_create(
+                TrendingScore(recipe_id=recipe_id, score=score,
+                              computed_at=now)
+                for recipe_id, score in scores.items()
+            )
+        deleted, _ = RecipeEvent.objects.filter(created_at__lt=since).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Рассчитана популярность {len(scores)} рецептов, '
+            f'удалено устаревших событий: {deleted}'
+        ))
@@ -1,17 +1,59 @@
 from django.db import models, transaction
+from django.db.models import BooleanField, Exists, F, OuterRef, Value
+from django.utils import timezone
 
 from api.models import RecipeShortLink
 from api.validators import RecipeDataValidator
 from ingredient.models import RecipeIngredient
 
 
-class RecipeManager(models.Manager):
+class RecipeQuerySet(models.QuerySet):
+    """Набор запросов для модели рецепта."""
+
+    def with_user_flags(self, user):
+        """Аннотирует рецепты флагами избранного и корзины пользователя.
+
+        Флаги вычисляются подзапросами Exists в одном запросе к базе,
+        поэтому их стоимость не зависит от размера страницы.
+        """
+        if user.is_anonymous:
+            return self.annotate(
+                is_favorited=Value(False, output_field=BooleanField()),
+                is_in_shopping_cart=Value(False, output_field=BooleanField()),
+            )
+        favorites = self.model.favorited_by.through.objects.filter(
+            recipe=OuterRef('pk'),
+            user=user,
+        )
+        cart_recipes = self.model.cart_set.through.objects.filter(
+            recipe=OuterRef('pk'),
+            cart__owner=user,
+        )
+        return self.annotate(
+            is_favorited=Exists(favorites),
+            is_in_shopping_cart=Exists(cart_recipes),
+        )
+
+    def bump_version(self):
+        """Увеличивает версию рецептов, сбрасывая их кешированные фрагменты."""
+        return self.update(
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+
+
+class RecipeManager(models.Manager.from_queryset(RecipeQuerySet)):
     """Менеджер для модели рецепта."""
 
-    def create(self, data):
+    def create(self, data, validated=False):
+        """Создание рецепта с ингредиентами, тегами и короткой ссылкой.
 
-        validator = RecipeDataValidator(data=data)
-        validator()
+        Если данные уже проверены сериализатором, повторная валидация
+        пропускается.
+        """
+        if not validated:
+            validator = RecipeDataValidator(data=data)
+            validator()
 
         name = data.get('name')
         author = data.get('author')
@@ -41,9 +83,6 @@ class RecipeManager(models.Manager):
 
             recipe.tags.set(tags_data)
 
-            short_link = RecipeShortLink.objects.create(
-                recipe=recipe,
-            )
-            short_link.save()
+            RecipeShortLink.objects.create(recipe=recipe)
 
             return recipe
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0009_alter_recipe_cooking_time'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['pub_date', 'id'], name='recipe_pub_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0010_recipe_pub_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Увеличивается при каждом изменении рецепта.', verbose_name='Версия'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 3.2 on 2026-10-18 16:50
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Recipe = apps.get_model('recipe', 'Recipe')
+    User = apps.get_model('users', 'User')
+    Cart = apps.get_model('cart', 'Cart')
+
+    def count(through):
+        return Coalesce(Subquery(
+            through.objects.filter(
+                recipe=OuterRef('pk')
+            ).values('recipe').annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    Recipe.objects.update(
+        favorites_count=count(User.favourites.through),
+        cart_count=count(Cart.recipes.through),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0012_recipe_tag_updated_at'),
+        ('users', '0006_remove_user_cart'),
+        ('cart', '0005_alter_cart_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='cart_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В корзинах'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В избранном'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-favorites_count', '-cart_count', '-pub_date'], name='recipe_popular_idx'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
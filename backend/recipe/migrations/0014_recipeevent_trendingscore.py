@@ -0,0 +1,41 @@
+# Generated by Django 3.2 on 2026-10-18 16:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0013_recipe_popularity_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('recipe', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='recipe.recipe', verbose_name='Рецепт')),
+                ('score', models.FloatField(db_index=True, verbose_name='Оценка')),
+                ('computed_at', models.DateTimeField(verbose_name='Дата расчёта')),
+            ],
+            options={
+                'verbose_name': 'Популярность рецепта',
+                'verbose_name_plural': 'Популярность рецептов',
+                'ordering': ['-score'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('favorite', 'Избранное'), ('cart', 'Корзина')], max_length=10, verbose_name='Тип события')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата события')),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='recipe.recipe', verbose_name='Рецепт')),
+            ],
+            options={
+                'verbose_name': 'Событие рецепта',
+                'verbose_name_plural': 'События рецептов',
+                'default_related_name': 'events',
+            },
+        ),
+    ]
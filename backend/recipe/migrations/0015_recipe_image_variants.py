@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0014_recipeevent_trendingscore'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Пути к уменьшенным копиям фото.', verbose_name='Копии фото'),
+        ),
+    ]
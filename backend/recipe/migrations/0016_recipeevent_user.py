@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 17:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipe', '0015_recipe_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipeevent',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='events', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+    ]
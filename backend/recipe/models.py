@@ -65,6 +65,33 @@ class Recipe(models.Model):
         db_index=True,
         verbose_name='Дата добавления',
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Пути к уменьшенным копиям фото.',
+        verbose_name='Копии фото'
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text='Увеличивается при каждом изменении рецепта.',
+        verbose_name='Версия'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
+    favorites_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='В избранном'
+    )
+    cart_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='В корзинах'
+    )
 
     objects = RecipeManager()
 
@@ -73,10 +100,37 @@ class Recipe(models.Model):
         verbose_name_plural = 'Рецепты'
         default_related_name = 'recipes'
         ordering = ['-pub_date', 'name']
+        indexes = [
+            models.Index(
+                fields=['pub_date', 'id'],
+                name='recipe_pub_date_id_idx',
+            ),
+            models.Index(
+                fields=['-favorites_count', '-cart_count', '-pub_date'],
+                name='recipe_popular_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.name}'
 
+    def save(self, *args, **kwargs):
+        if self.pk is None:
+            return super().save(*args, **kwargs)
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Счётчики и копии фото меняются сигналами и фоновыми
+            # задачами, обычное сохранение их не перезаписывает.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in c.DENORMALIZED_FIELDS
+            ]
+        elif kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        self.version = models.F('version') + 1
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=('version',))
+
 
 class Tag(models.Model):
     """Модель тега."""
@@ -94,6 +148,10 @@ class Tag(models.Model):
         null=False,
         verbose_name='Слаг'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
 
     class Meta:
         verbose_name = 'Тег'
@@ -102,3 +160,67 @@ class Tag(models.Model):
 
     def __str__(self):
         return f'{self.name}'
+
+
+class RecipeEvent(models.Model):
+    """Событие добавления рецепта в избранное или корзину.
+
+    Используется для расчёта популярности рецептов за последнее время.
+    Удаление рецепта из избранного или корзины удаляет событие, поэтому
+    у пользователя не больше одного события на рецепт и тип.
+    """
+
+    class Kind(models.TextChoices):
+        FAVORITE = 'favorite', 'Избранное'
+        CART = 'cart', 'Корзина'
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        verbose_name='Рецепт'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        verbose_name='Пользователь'
+    )
+    kind = models.CharField(
+        max_length=c.LEN_EVENT_KIND,
+        choices=Kind.choices,
+        verbose_name='Тип события'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Дата события'
+    )
+
+    class Meta:
+        verbose_name = 'Событие рецепта'
+        verbose_name_plural = 'События рецептов'
+        default_related_name = 'events'
+
+
+class TrendingScore(models.Model):
+    """Рассчитанная оценка популярности рецепта с учётом затухания."""
+
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending_score',
+        verbose_name='Рецепт'
+    )
+    score = models.FloatField(
+        db_index=True,
+        verbose_name='Оценка'
+    )
+    computed_at = models.DateTimeField(
+        verbose_name='Дата расчёта'
+    )
+
+    class Meta:
+        verbose_name = 'Популярность рецепта'
+        verbose_name_plural = 'Популярность рецептов'
+        ordering = ['-score']
@@ -0,0 +1,188 @@
+from contextlib import contextmanager
+from threading import local
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from api.models import TableVersion
+from cart.models import Cart
+from ingredient.models import Ingredient, RecipeIngredient
+from recipe.constants import AUTHOR_SERVICE_FIELDS
+from recipe.models import Recipe, RecipeEvent, Tag
+
+User = get_user_model()
+
+_state = local()
+
+
+@contextmanager
+def ingredient_changes_without_bump():
+    """Изменение ингредиентов без увеличения версии рецепта на каждую строку.
+
+    Используется, когда версия увеличивается один раз сохранением самого
+    рецепта.
+    """
+    _state.suppressed = True
+    try:
+        yield
+    finally:
+        _state.suppressed = False
+
+
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+def recipe_ingredient_changed(sender, instance, **kwargs):
+    """Изменение ингредиентов рецепта меняет его версию."""
+    if getattr(_state, 'suppressed', False):
+        return
+    Recipe.objects.filter(pk=instance.recipe_id).bump_version()
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Изменение тегов рецепта меняет его версию."""
+    if action in ('post_add', 'post_remove'):
+        recipe_ids = pk_set if reverse else {instance.pk}
+    elif action == 'pre_clear':
+        recipe_ids = (
+            set(instance.recipes.values_list('pk', flat=True))
+            if reverse else {instance.pk}
+        )
+    else:
+        return
+    Recipe.objects.filter(pk__in=recipe_ids).bump_version()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def tag_changed(sender, instance, **kwargs):
+    """Изменение тега меняет версию таблицы тегов и рецептов с ним."""
+    TableVersion.objects.bump(Tag)
+    Recipe.objects.filter(tags=instance).bump_version()
+
+
+@receiver(post_save, sender=Ingredient)
+def ingredient_changed(sender, instance, created, **kwargs):
+    """Изменение ингредиента меняет версию таблицы и рецептов с ним."""
+    TableVersion.objects.bump(Ingredient)
+    if not created:
+        Recipe.objects.filter(ingredients=instance).bump_version()
+
+
+@receiver(post_delete, sender=Ingredient)
+def ingredient_deleted(sender, instance, **kwargs):
+    """Удаление ингредиента меняет версию таблицы ингредиентов."""
+    TableVersion.objects.bump(Ingredient)
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, instance, created, update_fields, **kwargs):
+    """Изменение профиля автора меняет версию всех его рецептов."""
+    if created:
+        return
+    if update_fields and set(update_fields) <= AUTHOR_SERVICE_FIELDS:
+        return
+    Recipe.objects.filter(author=instance).bump_version()
+
+
+def _change_counter(counter, owner_field, sender, instance, action, reverse,
+                    pk_set):
+    """Изменение счётчика рецептов при изменении связи многие-ко-многим."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    sign = 1 if action == 'post_add' else -1
+    if reverse:
+        amount = (
+            len(pk_set) if pk_set is not None
+            else sender.objects.filter(recipe=instance).count()
+        )
+        recipes = Recipe.objects.filter(pk=instance.pk)
+    else:
+        amount = 1
+        recipe_ids = (
+            pk_set if pk_set is not None
+            else sender.objects.filter(
+                **{owner_field: instance}
+            ).values_list('recipe_id', flat=True)
+        )
+        recipes = Recipe.objects.filter(pk__in=recipe_ids)
+    if amount:
+        recipes.update(**{counter: Greatest(F(counter) + sign * amount, 0)})
+
+
+def _record_events(kind, owner_field, sender, instance, action, reverse,
+                   pk_set):
+    """Запись событий добавления рецептов для расчёта популярности.
+
+    При удалении рецепта из избранного или корзины событие его добавления
+    удаляется, поэтому повторные добавления не накручивают популярность.
+    """
+    if action == 'pre_clear':
+        if reverse:
+            pk_set = set(sender.objects.filter(
+                recipe=instance
+            ).values_list(f'{owner_field}_id', flat=True))
+        else:
+            pk_set = set(sender.objects.filter(
+                **{owner_field: instance}
+            ).values_list('recipe_id', flat=True))
+    elif action not in ('post_add', 'post_remove'):
+        return
+    if not pk_set:
+        return
+    if reverse:
+        user_ids = _owner_ids(owner_field, pk_set)
+        recipe_ids = {instance.pk}
+    else:
+        user_ids = {
+            instance.owner_id if owner_field == 'cart' else instance.pk
+        }
+        recipe_ids = pk_set
+    if action == 'post_add':
+        RecipeEvent.objects.bulk_create(
+            RecipeEvent(recipe_id=recipe_id, user_id=user_id, kind=kind)
+            for user_id in user_ids
+            for recipe_id in recipe_ids
+        )
+    else:
+        RecipeEvent.objects.filter(
+            kind=kind, user_id__in=user_ids, recipe_id__in=recipe_ids
+        ).delete()
+
+
+def _owner_ids(owner_field, pk_set):
+    """Id пользователей по id владельцев связи (пользователей или корзин)."""
+    if owner_field == 'cart':
+        return set(Cart.objects.filter(
+            pk__in=pk_set
+        ).values_list('owner_id', flat=True))
+    return pk_set
+
+
+@receiver(m2m_changed, sender=User.favourites.through)
+def favourites_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Поддержка счётчика добавлений рецепта в избранное."""
+    _change_counter(
+        'favorites_count', 'user', sender, instance, action, reverse, pk_set
+    )
+    _record_events(
+        RecipeEvent.Kind.FAVORITE, 'user', sender, instance, action,
+        reverse, pk_set
+    )
+
+
+@receiver(m2m_changed, sender=Cart.recipes.through)
+def cart_recipes_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    """Поддержка счётчика добавлений рецепта в корзины."""
+    _change_counter(
+        'cart_count', 'cart', sender, instance, action, reverse, pk_set
+    )
+    _record_events(
+        RecipeEvent.Kind.CART, 'cart', sender, instance, action, reverse,
+        pk_set
+    )
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from recipe.models import Recipe
+
+User = get_user_model()
+
+
+class RecipeSaveTest(TestCase):
+    """Сохранение рецепта не затирает поля, которые ведут сигналы."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='author', email='author@example.com',
+            password='password', first_name='Author', last_name='Author',
+        )
+        cls.reader = User.objects.create_user(
+            username='reader', email='reader@example.com',
+            password='password', first_name='Reader', last_name='Reader',
+        )
+        cls.recipe = Recipe(
+            name='Рецепт', author=cls.author, text='Текст',
+            cooking_time=10, image='recipes/foto/recipe.png',
+        )
+        cls.recipe.save()
+
+    def test_stale_save_keeps_counters(self):
+        stale = Recipe.objects.get(pk=self.recipe.pk)
+        self.reader.favourites.add(self.recipe)
+        self.reader.cart.recipes.add(self.recipe)
+
+        stale.name = 'Новое название'
+        stale.save()
+
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertEqual(recipe.name, 'Новое название')
+        self.assertEqual(recipe.favorites_count, 1)
+        self.assertEqual(recipe.cart_count, 1)
+
+    def test_stale_save_keeps_image_variants(self):
+        stale = Recipe.objects.get(pk=self.recipe.pk)
+        variants = {'source': 'recipes/foto/recipe.png'}
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            image_variants=variants
+        )
+
+        stale.save()
+
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertEqual(recipe.image_variants, variants)
+
+    def test_save_bumps_version(self):
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        version = recipe.version
+
+        recipe.save()
+
+        self.assertEqual(recipe.version, version + 1)
+        self.assertEqual(
+            Recipe.objects.get(pk=recipe.pk).version, version + 1
+        )
+
+    def test_save_with_update_fields_bumps_version(self):
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        version = recipe.version
+
+        recipe.name = 'Новое название'
+        recipe.save(update_fields=('name',))
+
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertEqual(recipe.name, 'Новое название')
+        self.assertEqual(recipe.version, version + 1)
@@ -0,0 +1,70 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from recipe.models import Recipe, RecipeEvent, TrendingScore
+
+User = get_user_model()
+
+
+class TrendingEventsTest(TestCase):
+    """События популярности не накручиваются повторными добавлениями."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.reader, cls.other = (
+            User.objects.create_user(
+                username=name, email=f'{name}@example.com',
+                password='password', first_name=name, last_name=name,
+            ) for name in ('author', 'reader', 'other')
+        )
+        cls.recipe = Recipe(
+            name='Рецепт', author=cls.author, text='Текст',
+            cooking_time=10, image='recipes/foto/recipe.png',
+        )
+        cls.recipe.save()
+
+    def refresh(self):
+        call_command('refresh_trending', stdout=StringIO())
+        return set(TrendingScore.objects.values_list('recipe_id', flat=True))
+
+    def test_toggling_favorite_leaves_no_events(self):
+        for _ in range(3):
+            self.reader.favourites.add(self.recipe)
+            self.reader.favourites.remove(self.recipe)
+
+        self.assertFalse(RecipeEvent.objects.exists())
+        self.assertNotIn(self.recipe.pk, self.refresh())
+
+    def test_toggling_cart_from_recipe_side(self):
+        carts = (self.reader.cart, self.other.cart)
+        for _ in range(3):
+            self.recipe.cart_set.add(*carts)
+            self.recipe.cart_set.remove(self.reader.cart)
+
+        self.assertEqual(
+            list(RecipeEvent.objects.values_list('user_id', 'kind')),
+            [(self.other.pk, RecipeEvent.Kind.CART)],
+        )
+
+    def test_clear_removes_events(self):
+        self.reader.favourites.add(self.recipe)
+        self.other.favourites.add(self.recipe)
+
+        self.reader.favourites.clear()
+        self.assertEqual(
+            list(RecipeEvent.objects.values_list('user_id', flat=True)),
+            [self.other.pk],
+        )
+        self.recipe.favorited_by.clear()
+        self.assertFalse(RecipeEvent.objects.exists())
+
+    def test_current_favorite_is_trending(self):
+        self.reader.favourites.add(self.recipe)
+        self.reader.favourites.remove(self.recipe)
+        self.reader.favourites.add(self.recipe)
+
+        self.assertEqual(RecipeEvent.objects.count(), 1)
+        self.assertIn(self.recipe.pk, self.refresh())
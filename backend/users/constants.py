@@ -5,3 +5,5 @@ LEN_FIRSTNAME = 150
 LEN_LASTNAME = 150
 
 MAX_FILE_SIZE = 10 * 1024 * 1024
+
+DENORMALIZED_FIELDS = frozenset(('image_variants',))
@@ -68,6 +68,13 @@ class User(AbstractUser):
         verbose_name='Аватар',
         help_text=f'Не более {c.MAX_FILE_SIZE / (1024 * 1024)} Мб'
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Пути к уменьшенным копиям аватара.',
+        verbose_name='Копии аватара'
+    )
     subscriptions = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
         symmetrical=False,
@@ -95,6 +102,17 @@ class User(AbstractUser):
     def __str__(self):
         return f'{self.username}'
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Копии аватара пишет фоновая задача, обычное сохранение
+            # их не перезаписывает.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in c.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def clean(self):
         super().clean()
         self.email = self.__class__.objects.normalize_email(self.email)